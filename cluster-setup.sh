@@ -0,0 +1,47 @@
+#!/bin/bash
+
+# 로컬 Redis Cluster 테스트 스크립트
+# redis-server --cluster-enabled로 primary 3개 노드(7000~7002)를 시작하고 클러스터를 구성합니다.
+# 사용법: ./cluster-setup.sh [start|stop]
+
+set -e
+
+PORTS="7000 7001 7002"
+CLUSTER_DIR="cluster"
+
+if [ "$1" = "stop" ]; then
+    echo "=== 로컬 Redis Cluster 종료 ==="
+    for port in $PORTS; do
+        redis-cli -p $port shutdown nosave 2>/dev/null || true
+    done
+    rm -rf "$CLUSTER_DIR"
+    echo "종료 완료."
+    exit 0
+fi
+
+echo "=== 로컬 Redis Cluster 시작 ==="
+
+NODES=""
+for port in $PORTS; do
+    mkdir -p "$CLUSTER_DIR/$port"
+    redis-server --port $port \
+        --cluster-enabled yes \
+        --cluster-config-file nodes.conf \
+        --cluster-node-timeout 5000 \
+        --appendonly no \
+        --save "" \
+        --dir "$CLUSTER_DIR/$port" \
+        --daemonize yes
+    NODES="$NODES 127.0.0.1:$port"
+done
+
+sleep 1
+echo "클러스터를 구성합니다..."
+redis-cli --cluster create $NODES --cluster-replicas 0 --cluster-yes
+
+echo "구성 완료. 로거 실행:"
+echo "python main.py --config config/cluster.json"
+echo "샤드 채널 메시지 발행:"
+echo "python load_generator.py --config config/cluster.json --sharded --channel-prefix shard: --channels 4"
+echo "slot 이전 테스트 예시:"
+echo "redis-cli --cluster reshard 127.0.0.1:7000 --cluster-from <node-id> --cluster-to <node-id> --cluster-slots 1000 --cluster-yes"
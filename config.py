@@ -6,6 +6,9 @@ import json
 import argparse
 import sys
 from typing import Dict, Any
+from redis.backoff import ExponentialBackoff
+from redis.exceptions import ConnectionError as RedisConnectionError
+from redis.retry import Retry
 
 
 class Config:
@@ -101,6 +104,27 @@ class Config:
     def REDIS_EXPONENTIAL_BACKOFF_MULTIPLIER(self) -> float:
         return self._get_nested_value('redis', 'exponential_backoff', 'multiplier')
     
+    # Redis Cluster 설정
+    @property
+    def REDIS_CLUSTER_ENABLED(self) -> bool:
+        return self._get_nested_value('redis', 'cluster', 'enabled', default=False)
+    
+    @property
+    def REDIS_CLUSTER_STARTUP_NODES(self) -> list:
+        return self._get_nested_value('redis', 'cluster', 'startup_nodes', default=[])
+    
+    @property
+    def REDIS_CLUSTER_SHARD_CHANNELS(self) -> list:
+        return self._get_nested_value('redis', 'cluster', 'shard_channels', default=[])
+    
+    @property
+    def REDIS_CLUSTER_TOPOLOGY_REFRESH_SECONDS(self) -> int:
+        return self._get_nested_value('redis', 'cluster', 'topology_refresh_seconds', default=30)
+    
+    @property
+    def REDIS_CLUSTER_QUEUE_SIZE(self) -> int:
+        return self._get_nested_value('redis', 'cluster', 'queue_size', default=10000)
+    
     # 로깅 설정
     @property
     def LOG_DIR(self) -> str:
@@ -118,6 +142,22 @@ class Config:
     def LOG_BACKUP_COUNT(self) -> int:
         return self._get_nested_value('logging', 'log_backup_count')
     
+    @property
+    def LOG_FORMAT(self) -> str:
+        return self._get_nested_value('logging', 'format', default='text')
+    
+    @property
+    def LOG_QUEUE_SIZE(self) -> int:
+        return self._get_nested_value('logging', 'queue_size', default=10000)
+    
+    @property
+    def LOG_COALESCE_SECONDS(self) -> float:
+        return self._get_nested_value('logging', 'coalesce_seconds', default=10)
+    
+    @property
+    def LOG_MAX_OPEN_FILES(self) -> int:
+        return self._get_nested_value('logging', 'max_open_files', default=256)
+    
     # 필터링 설정
     @property
     def TARGET_FIELD(self) -> str:
@@ -144,6 +184,102 @@ class Config:
     def HEARTBEAT_INTERVAL_SECONDS(self) -> int:
         return self._get_nested_value('heartbeat', 'interval_seconds')
     
+    # 출력 규칙(projection) 설정
+    @property
+    def PROJECTION_CHANNELS(self) -> dict:
+        return self._get_nested_value('projection', 'channels', default={})
+    
+    @property
+    def PROJECTION_MASK_VALUE(self) -> str:
+        return self._get_nested_value('projection', 'mask_value', default='***')
+    
+    @property
+    def PROJECTION_HASH_SALT(self) -> str:
+        return self._get_nested_value('projection', 'hash_salt', default='')
+    
+    # 집계 설정
+    @property
+    def AGGREGATION_ENABLED(self) -> bool:
+        return self._get_nested_value('aggregation', 'enabled', default=False)
+    
+    @property
+    def AGGREGATION_WINDOW_SECONDS(self) -> int:
+        return self._get_nested_value('aggregation', 'window_seconds', default=60)
+    
+    @property
+    def AGGREGATION_INCLUDE_KEY(self) -> bool:
+        return self._get_nested_value('aggregation', 'include_key', default=True)
+    
+    @property
+    def AGGREGATION_TOP_K(self) -> int:
+        return self._get_nested_value('aggregation', 'top_k', default=10)
+    
+    @property
+    def AGGREGATION_MAX_KEYS(self) -> int:
+        return self._get_nested_value('aggregation', 'max_keys', default=10000)
+    
+    @property
+    def AGGREGATION_SKETCH_WIDTH(self) -> int:
+        return self._get_nested_value('aggregation', 'sketch_width', default=2048)
+    
+    @property
+    def AGGREGATION_SKETCH_DEPTH(self) -> int:
+        return self._get_nested_value('aggregation', 'sketch_depth', default=4)
+    
+    @property
+    def AGGREGATION_ROLLUP_DIR(self) -> str:
+        return self._get_nested_value('aggregation', 'rollup_dir', default='rollup')
+    
+    # 스케줄링 설정
+    @property
+    def SCHEDULING_ENABLED(self) -> bool:
+        return self._get_nested_value('scheduling', 'enabled', default=False)
+    
+    @property
+    def SCHEDULING_QUANTUM_BYTES(self) -> int:
+        return self._get_nested_value('scheduling', 'quantum_bytes', default=65536)
+    
+    @property
+    def SCHEDULING_MAX_QUEUE_SIZE(self) -> int:
+        return self._get_nested_value('scheduling', 'max_queue_size', default=10000)
+    
+    @property
+    def SCHEDULING_STATS_INTERVAL_SECONDS(self) -> int:
+        return self._get_nested_value('scheduling', 'stats_interval_seconds', default=60)
+    
+    @property
+    def SCHEDULING_SPILL_DIR(self) -> str:
+        return self._get_nested_value('scheduling', 'spill_dir', default='spill')
+    
+    @property
+    def SCHEDULING_DEFAULT_POLICY(self) -> dict:
+        return self._get_nested_value('scheduling', 'default', default={})
+    
+    @property
+    def SCHEDULING_CHANNEL_POLICIES(self) -> dict:
+        return self._get_nested_value('scheduling', 'channels', default={})
+    
+    @property
+    def SCHEDULING_IDLE_CHANNEL_SECONDS(self) -> int:
+        return self._get_nested_value('scheduling', 'idle_channel_seconds', default=300)
+    
+    @property
+    def SCHEDULING_SHUTDOWN_TIMEOUT_SECONDS(self) -> float:
+        return self._get_nested_value('scheduling', 'shutdown_timeout_seconds', default=10)
+    
+    # 재처리(replay) 설정
+    @property
+    def REPLAY_WORKERS(self) -> int:
+        return self._get_nested_value('replay', 'workers', default=0)
+    
+    @property
+    def REPLAY_BATCH_SIZE(self) -> int:
+        return self._get_nested_value('replay', 'batch_size', default=10000)
+    
+    @property
+    def REPLAY_PROGRESS_INTERVAL_SECONDS(self) -> int:
+        return self._get_nested_value('replay', 'progress_interval_seconds', default=10)
+    
     def get_redis_config(self) -> Dict[str, Any]:
         """Redis 연결 설정을 반환합니다."""
         config = {
@@ -151,10 +287,18 @@ class Config:
             'port': self.REDIS_PORT,
             'db': self.REDIS_DB,
             'retry_on_timeout': self.REDIS_RETRY_ON_TIMEOUT,
-            'retry_on_error': self.REDIS_RETRY_ON_ERROR,
-            'retry': self.REDIS_RETRY,
         }
         
+        # redis-py는 retry_on_error에 예외 목록, retry에 Retry 객체를 받음
+        if self.REDIS_RETRY_ON_ERROR:
+            config['retry_on_error'] = [RedisConnectionError]
+        if self.REDIS_RETRY:
+            backoff = ExponentialBackoff(
+                cap=self.REDIS_EXPONENTIAL_BACKOFF_MAX_DELAY,
+                base=self.REDIS_EXPONENTIAL_BACKOFF_BASE_DELAY
+            )
+            config['retry'] = Retry(backoff, self.REDIS_RETRY)
+        
         if self.REDIS_PASSWORD:
             config['password'] = self.REDIS_PASSWORD
             
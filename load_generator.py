@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""
+Redis PubSub 부하 생성기
+
+여러 프로세스에서 파이프라인 PUBLISH로 목표 발행률(또는 최대 속도)의 메시지를 발행합니다.
+--sharded 지정 시 Redis Cluster에 SPUBLISH로 샤드 채널 메시지를 발행합니다.
+각 메시지에는 예정 발행 시각(scheduled_ts)과 실제 발행 시각(sent_ts)이 포함되어,
+로거 측에서 coordinated omission 없이 end-to-end 지연 시간을 계산할 수 있습니다.
+"""
+import argparse
+import bisect
+import itertools
+import json
+import math
+import multiprocessing
+import random
+import sys
+import time
+import datetime
+from typing import Dict, Any, List, Optional, Tuple
+
+import redis
+from redis.cluster import RedisCluster, ClusterNode
+from redis.exceptions import RedisClusterException
+from config import Config
+
+
+# 필터링 조건을 만족하지 않는 target 값
+NON_MATCHING_TARGET = 'LOADGEN_NOMATCH'
+
+# 서버 측 오류 확인용 INFO 항목
+SERVER_ERROR_STATS = ('total_error_replies', 'rejected_connections', 'client_output_buffer_limit_disconnections')
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """명령행 인자를 파싱합니다."""
+    parser = argparse.ArgumentParser(description='Redis PubSub 부하 생성기')
+    parser.add_argument('--config', '-c', type=str, default='config/default.json',
+                        help='설정 파일 경로 (기본값: config/default.json)')
+    parser.add_argument('--rate', type=float, default=1000.0,
+                        help='전체 목표 발행률 (msg/s, 0이면 최대 속도) (기본값: 1000)')
+    parser.add_argument('--duration', type=float, default=10.0,
+                        help='발행 시간 (초) (기본값: 10)')
+    parser.add_argument('--count', type=int, default=0,
+                        help='전체 발행 메시지 수 (지정 시 --duration보다 우선)')
+    parser.add_argument('--processes', type=int, default=1,
+                        help='발행 프로세스 수 (기본값: 1)')
+    parser.add_argument('--pipeline', type=int, default=100,
+                        help='파이프라인당 PUBLISH 개수 (기본값: 100)')
+    parser.add_argument('--channels', type=int, default=4,
+                        help='채널 수 (기본값: 4)')
+    parser.add_argument('--channel-prefix', type=str, default='loadgen:channel:',
+                        help='채널명 접두어 (기본값: loadgen:channel:)')
+    parser.add_argument('--keys', type=int, default=1000,
+                        help='키(key_field) 카디널리티 (기본값: 1000)')
+    parser.add_argument('--key-dist', choices=['uniform', 'zipf'], default='uniform',
+                        help='키 분포 (기본값: uniform)')
+    parser.add_argument('--zipf-s', type=float, default=1.1,
+                        help='Zipf 분포 지수 (기본값: 1.1)')
+    parser.add_argument('--payload-size', type=int, default=128,
+                        help='payload 평균 크기 (bytes) (기본값: 128)')
+    parser.add_argument('--payload-dist', choices=['fixed', 'uniform', 'exponential'], default='fixed',
+                        help='payload 크기 분포 (기본값: fixed)')
+    parser.add_argument('--payload-max', type=int, default=65536,
+                        help='payload 최대 크기 (bytes) (기본값: 65536)')
+    parser.add_argument('--match-ratio', type=float, default=1.0,
+                        help='filtering.target_values와 일치하는 메시지 비율 (0.0~1.0) (기본값: 1.0)')
+    parser.add_argument('--match-values', type=str, nargs='+', default=None,
+                        help='일치 메시지에 사용할 target 값 (기본값: filtering.target_values)')
+    parser.add_argument('--seed', type=int, default=None,
+                        help='난수 시드')
+    parser.add_argument('--sharded', action='store_true',
+                        help='Redis Cluster에 SPUBLISH로 발행 (redis.cluster.startup_nodes 사용)')
+    return parser.parse_args(argv)
+
+
+class MessageGenerator:
+    """부하 메시지 생성 클래스"""
+
+    def __init__(self, args: argparse.Namespace, target_field: str, key_field: str,
+                 match_values: List[str], seed: Optional[int] = None):
+        self.args = args
+        self.target_field = target_field
+        self.key_field = key_field
+        self.match_values = match_values
+        self.random = random.Random(seed)
+        self.channels = [f'{args.channel_prefix}{i}' for i in range(args.channels)]
+        self.keys = [f'key{i}' for i in range(args.keys)]
+        self.key_cum_weights = self._build_key_cum_weights()
+        self.padding = 'x' * args.payload_max
+
+    def _build_key_cum_weights(self) -> Optional[List[float]]:
+        """Zipf 분포의 누적 가중치를 계산합니다. (uniform이면 None)"""
+        if self.args.key_dist != 'zipf':
+            return None
+        weights = [1.0 / ((rank + 1) ** self.args.zipf_s) for rank in range(len(self.keys))]
+        return list(itertools.accumulate(weights))
+
+    def _pick_key(self) -> str:
+        """분포에 따라 키를 선택합니다."""
+        if self.key_cum_weights is None:
+            return self.keys[self.random.randrange(len(self.keys))]
+        total = self.key_cum_weights[-1]
+        index = bisect.bisect_left(self.key_cum_weights, self.random.random() * total)
+        return self.keys[min(index, len(self.keys) - 1)]
+
+    def _payload_size(self) -> int:
+        """분포에 따라 payload 크기를 선택합니다."""
+        mean = self.args.payload_size
+        if self.args.payload_dist == 'uniform':
+            size = self.random.randint(0, 2 * mean)
+        elif self.args.payload_dist == 'exponential':
+            size = int(self.random.expovariate(1.0 / mean)) if mean > 0 else 0
+        else:
+            size = mean
+        return min(size, self.args.payload_max)
+
+    def _pick_target(self) -> str:
+        """match ratio에 따라 target 값을 선택합니다."""
+        if self.match_values and self.random.random() < self.args.match_ratio:
+            return self.match_values[self.random.randrange(len(self.match_values))]
+        return NON_MATCHING_TARGET
+
+    def build(self, seq: int, scheduled_ts: float) -> Tuple[str, str]:
+        """
+        채널명과 JSON 메시지를 생성합니다.
+
+        Args:
+            seq: 메시지 일련번호
+            scheduled_ts: 예정 발행 시각 (epoch seconds)
+
+        Returns:
+            tuple: (채널명, JSON 메시지)
+        """
+        sent_ts = time.time()
+        message = {
+            self.key_field: self._pick_key(),
+            self.target_field: self._pick_target(),
+            'seq': seq,
+            'scheduled_ts': scheduled_ts,
+            'sent_ts': sent_ts,
+            'timestamp': datetime.datetime.fromtimestamp(sent_ts).isoformat(),
+            'payload': self.padding[:self._payload_size()],
+        }
+        channel = self.channels[self.random.randrange(len(self.channels))]
+        return channel, json.dumps(message, ensure_ascii=False)
+
+
+def _create_client(redis_config: Dict[str, Any], startup_nodes: Optional[List[str]]) -> redis.Redis:
+    """Redis 클라이언트를 생성합니다. (startup_nodes가 있으면 RedisCluster)"""
+    if startup_nodes is None:
+        return redis.Redis(**redis_config)
+
+    node_config = {key: value for key, value in redis_config.items() if key not in ('host', 'port', 'db')}
+    nodes = [ClusterNode(*node.rsplit(':', 1)) for node in startup_nodes]
+    return RedisCluster(startup_nodes=nodes, **node_config)
+
+
+def _publish_worker(worker_id: int, args: argparse.Namespace, redis_config: Dict[str, Any],
+                    startup_nodes: Optional[List[str]], target_field: str, key_field: str,
+                    match_values: List[str], start_ts: float, result_queue: multiprocessing.Queue):
+    """
+    발행 워커 프로세스입니다.
+
+    예정 발행 시각은 시작 시각과 목표 발행률로만 결정되며(open-loop),
+    발행이 지연되더라도 일정이 뒤로 밀리지 않습니다.
+    """
+    seed = None if args.seed is None else args.seed + worker_id
+    generator = MessageGenerator(args, target_field, key_field, match_values, seed)
+    worker_rate = args.rate / args.processes if args.rate > 0 else 0.0
+    worker_count = None
+    if args.count > 0:
+        worker_count = args.count // args.processes + (1 if worker_id < args.count % args.processes else 0)
+    end_ts = start_ts + args.duration
+
+    stats = {'sent': 0, 'errors': 0, 'error_samples': [], 'max_lag': 0.0, 'elapsed': 0.0}
+
+    try:
+        client = _create_client(redis_config, startup_nodes)
+        pipe = client.pipeline(transaction=False)
+        publish = pipe.spublish if args.sharded else pipe.publish
+
+        # 모든 워커가 같은 시각에 시작하도록 대기
+        time.sleep(max(0.0, start_ts - time.time()))
+
+        seq = 0
+        while True:
+            if worker_count is not None and seq >= worker_count:
+                break
+            batch = args.pipeline if worker_count is None else min(args.pipeline, worker_count - seq)
+
+            if worker_rate > 0:
+                scheduled_ts = start_ts + seq / worker_rate
+                if worker_count is None and scheduled_ts >= end_ts:
+                    break
+                delay = scheduled_ts - time.time()
+                if delay > 0:
+                    time.sleep(delay)
+
+                # 예정 시각이 지난 메시지만 발행 (일정보다 먼저 발행하지 않음)
+                due = int((time.time() - start_ts) * worker_rate) + 1 - seq
+                if worker_count is None:
+                    due = min(due, math.ceil(args.duration * worker_rate) - seq)
+                batch = max(1, min(batch, due))
+            elif worker_count is None and time.time() >= end_ts:
+                break
+
+            for i in range(batch):
+                message_seq = seq + i
+                now = time.time()
+                if worker_rate > 0:
+                    scheduled_ts = start_ts + message_seq / worker_rate
+                    stats['max_lag'] = max(stats['max_lag'], now - scheduled_ts)
+                else:
+                    scheduled_ts = now
+                channel, message = generator.build(worker_id * 1_000_000_000 + message_seq, scheduled_ts)
+                publish(channel, message)
+
+            for response in pipe.execute(raise_on_error=False):
+                if isinstance(response, Exception):
+                    stats['errors'] += 1
+                    if len(stats['error_samples']) < 5:
+                        stats['error_samples'].append(str(response))
+                else:
+                    stats['sent'] += 1
+            seq += batch
+
+        client.close()
+    except (redis.RedisError, RedisClusterException) as e:
+        stats['errors'] += 1
+        stats['error_samples'].append(f'워커 {worker_id}: {str(e)}')
+    finally:
+        stats['elapsed'] = time.time() - start_ts
+        result_queue.put(stats)
+
+
+def _read_server_error_stats(client: redis.Redis) -> Optional[Dict[str, int]]:
+    """서버 측 오류 관련 INFO 통계를 읽습니다. (INFO 미지원 시 None)"""
+    try:
+        info = client.info()
+    except redis.ResponseError:
+        return None
+    return {name: int(info.get(name, 0)) for name in SERVER_ERROR_STATS}
+
+
+def run_load(args: argparse.Namespace):
+    """부하 생성을 실행하고 결과를 출력합니다."""
+    config = Config()
+    redis_config = config.get_redis_config()
+
+    if args.match_values:
+        match_values = args.match_values
+    elif config.USE_REGEX:
+        print("오류: filtering.use_regex가 활성화된 경우 --match-values로 target 값을 지정해야 합니다.")
+        sys.exit(1)
+    else:
+        match_values = config.TARGET_VALUES or []
+
+    startup_nodes = None
+    if args.sharded:
+        startup_nodes = config.REDIS_CLUSTER_STARTUP_NODES or [f"{config.REDIS_HOST}:{config.REDIS_PORT}"]
+
+    try:
+        client = _create_client(redis_config, startup_nodes)
+        client.ping()
+        # INFO는 노드별 통계이므로 클러스터 발행 시에는 생략
+        before = None if args.sharded else _read_server_error_stats(client)
+    except (redis.RedisError, RedisClusterException) as e:
+        print(f"오류: Redis 연결 실패: {str(e)}")
+        sys.exit(1)
+
+    print("Redis PubSub 부하 생성 시작...")
+    print(f"Redis 서버: {', '.join(startup_nodes) if startup_nodes else f'{config.REDIS_HOST}:{config.REDIS_PORT}'}"
+          f"{' (Redis Cluster, SPUBLISH)' if args.sharded else ''}")
+    rate_text = f"{args.rate:.0f} msg/s" if args.rate > 0 else "최대 속도"
+    amount_text = f"{args.count}건" if args.count > 0 else f"{args.duration:.1f}초"
+    print(f"목표 발행률: {rate_text}, 발행량: {amount_text}, 프로세스: {args.processes}, 파이프라인: {args.pipeline}")
+
+    result_queue = multiprocessing.Queue()
+    start_ts = time.time() + 0.5
+    workers = [
+        multiprocessing.Process(
+            target=_publish_worker,
+            args=(worker_id, args, redis_config, startup_nodes, config.TARGET_FIELD, config.KEY_FIELD,
+                  match_values, start_ts, result_queue)
+        )
+        for worker_id in range(args.processes)
+    ]
+    for worker in workers:
+        worker.start()
+
+    results = [result_queue.get() for _ in workers]
+    for worker in workers:
+        worker.join()
+
+    sent = sum(result['sent'] for result in results)
+    errors = sum(result['errors'] for result in results)
+    elapsed = max((result['elapsed'] for result in results), default=0.0)
+    max_lag = max((result['max_lag'] for result in results), default=0.0)
+
+    print("부하 생성 완료!")
+    print(f"발행 성공: {sent}건, 발행 오류: {errors}건, 소요 시간: {elapsed:.2f}초")
+    print(f"달성 발행률: {sent / elapsed if elapsed > 0 else 0.0:.0f} msg/s")
+    if args.rate > 0:
+        print(f"최대 일정 지연: {max_lag * 1000:.1f} ms")
+    for result in results:
+        for sample in result['error_samples']:
+            print(f"오류: {sample}")
+
+    try:
+        after = None if args.sharded else _read_server_error_stats(client)
+        for name in SERVER_ERROR_STATS if before and after else ():
+            print(f"서버 {name}: +{after[name] - before[name]}")
+    except redis.RedisError as e:
+        print(f"서버 통계 조회 실패: {str(e)}")
+    finally:
+        client.close()
+
+
+def main():
+    """메인 함수"""
+    args = parse_args()
+    if args.processes < 1 or args.pipeline < 1 or args.channels < 1 or args.keys < 1:
+        print("오류: --processes, --pipeline, --channels, --keys는 1 이상이어야 합니다.")
+        sys.exit(1)
+    if not 0.0 <= args.match_ratio <= 1.0:
+        print("오류: --match-ratio는 0.0~1.0 사이여야 합니다.")
+        sys.exit(1)
+    run_load(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,11 +2,17 @@
 """
 Redis PubSub 로깅 시스템 메인 모듈
 """
+import os
 import signal
 import sys
+import argparse
 from services.redis_service import RedisService
+from services.redis_cluster_service import RedisClusterService
 from services.message_service import MessageService
+from services.scheduler_service import SchedulerService
+from services.replay_service import ReplayService
 from utils.logger import Logger
+from config import Config
 
 
 class RedisPubSubLogger:
@@ -14,9 +20,12 @@ class RedisPubSubLogger:
     
     def __init__(self):
         self.logger = Logger('Main')
+        self.config = Config()
         self.redis_service = None
         self.message_service = None
+        self.scheduler_service = None
         self.running = False
+        self.received_signal = None
         
         # 시그널 핸들러 설정
         signal.signal(signal.SIGINT, self._signal_handler)
@@ -28,8 +37,13 @@ class RedisPubSubLogger:
             self.logger.info("Redis PubSub 로깅 시스템 시작")
             
             # 서비스 초기화
-            self.redis_service = RedisService()
+            if self.config.REDIS_CLUSTER_ENABLED:
+                self.redis_service = RedisClusterService()
+            else:
+                self.redis_service = RedisService()
             self.message_service = MessageService()
+            if self.config.SCHEDULING_ENABLED:
+                self.scheduler_service = SchedulerService(self.message_service.process_message)
             
             # 모든 채널 구독
             self.redis_service.subscribe_all_channels()
@@ -41,6 +55,8 @@ class RedisPubSubLogger:
             
         except KeyboardInterrupt:
             self.logger.info("사용자에 의해 중단됨")
+        except SystemExit:
+            self.logger.info(f"시그널 {self.received_signal} 수신, 종료 중...")
         except Exception as e:
             self.logger.error(f"애플리케이션 시작 중 오류: {str(e)}")
         finally:
@@ -54,13 +70,24 @@ class RedisPubSubLogger:
             channel: 채널명
             message: 메시지 데이터
         """
-        if self.running:
+        if not self.running:
+            return
+        
+        if self.scheduler_service:
+            self.scheduler_service.submit(channel, message)
+        else:
             self.message_service.process_message(channel, message)
     
     def _signal_handler(self, signum, frame):
-        """시그널 핸들러"""
-        self.logger.info(f"시그널 {signum} 수신, 종료 중...")
-        self.stop()
+        """
+        시그널 핸들러
+
+        핸들러에서 직접 종료 처리를 하면 메인 스레드가 잡고 있던 lock을 다시 잡으려다 멈출 수 있으므로,
+        예외로 수신 루프를 빠져나간 뒤 start()의 finally에서 stop()을 호출합니다.
+        """
+        if self.received_signal is not None:
+            return
+        self.received_signal = signum
         sys.exit(0)
     
     def stop(self):
@@ -70,11 +97,66 @@ class RedisPubSubLogger:
         if self.redis_service:
             self.redis_service.close()
         
+        if self.scheduler_service:
+            self.scheduler_service.close()
+        
+        if self.message_service:
+            self.message_service.close()
+        
         self.logger.info("Redis PubSub 로깅 시스템 종료")
 
 
+def parse_args() -> argparse.Namespace:
+    """명령행 인자를 파싱합니다."""
+    parser = argparse.ArgumentParser(description='Redis PubSub 로깅 시스템')
+    parser.add_argument(
+        'command',
+        nargs='?',
+        choices=['run', 'replay'],
+        default='run',
+        help='run: Redis PubSub 수신 (기본값), replay: 파일 재처리'
+    )
+    parser.add_argument(
+        '--config',
+        '-c',
+        type=str,
+        default='config/default.json',
+        help='설정 파일 경로 (기본값: config/default.json)'
+    )
+    parser.add_argument('--input', '-i', type=str, help='replay 입력 파일/디렉토리 경로 (-이면 표준 입력)')
+    parser.add_argument('--workers', type=int, help='replay 워커 프로세스 수 (기본값: replay.workers, 0이면 CPU 수)')
+    parser.add_argument('--batch-size', type=int, help='replay 배치 크기 (기본값: replay.batch_size)')
+    parser.add_argument('--channel', type=str, default='replay', help='채널 정보가 없는 입력 레코드의 채널명 (기본값: replay)')
+    
+    args = parser.parse_args()
+    if args.command == 'replay' and not args.input:
+        parser.error('replay에는 --input이 필요합니다.')
+    return args
+
+
+def replay(args: argparse.Namespace):
+    """파일 재처리를 실행합니다."""
+    config = Config()
+    workers = args.workers if args.workers is not None else config.REPLAY_WORKERS
+    batch_size = args.batch_size or config.REPLAY_BATCH_SIZE
+    replay_service = ReplayService(args.input, workers or os.cpu_count() or 1, batch_size, args.channel)
+    
+    # 재처리 결과를 기록하는 디렉토리를 입력으로 쓰면 기록한 라인을 다시 읽게 됨
+    if args.input != '-' and replay_service.is_message_output(args.input):
+        print(f"오류: 메시지 로그 출력 디렉토리({config.MESSAGE_LOG_DIR}) 안의 파일은 재처리할 수 없습니다. 다른 위치로 옮긴 후 재처리하세요.")
+        sys.exit(1)
+    
+    replay_service.run()
+
+
 def main():
     """메인 함수"""
+    args = parse_args()
+    
+    if args.command == 'replay':
+        replay(args)
+        return
+    
     app = RedisPubSubLogger()
     app.start()
 
@@ -0,0 +1,170 @@
+"""
+메시지 집계 서비스 모듈
+"""
+import os
+import json
+import time
+import datetime
+import threading
+from typing import Dict, Optional, Tuple
+from utils.logger import Logger
+from utils.sketch import TopK
+from config import Config
+
+
+# 종료 시 lock 최대 대기 시간 (초)
+CLOSE_LOCK_TIMEOUT_SECONDS = 1.0
+
+
+class AggregationWindow:
+    """하나의 tumbling window에 대한 집계 카운터 클래스"""
+
+    def __init__(self, start: float, config: Config):
+        self.start = start
+        self.total = 0
+        self.counts: Dict[Tuple[str, str], int] = {}
+        self.key_counts: Dict[Tuple[str, str, str], int] = {}
+        self.overflow_count = 0
+        self.key_overflow_count = 0
+        self.max_keys = config.AGGREGATION_MAX_KEYS
+        self.include_key = config.AGGREGATION_INCLUDE_KEY
+        self.top_k = TopK(config.AGGREGATION_TOP_K, config.AGGREGATION_SKETCH_WIDTH, config.AGGREGATION_SKETCH_DEPTH)
+
+    def add(self, channel: str, target_value: str, key_value: str):
+        """메시지 한 건을 집계합니다."""
+        self.total += 1
+
+        # 채널/target 카운터 (카디널리티 상한 초과분은 overflow로 집계)
+        counter_key = (channel, target_value)
+        if counter_key in self.counts or len(self.counts) < self.max_keys:
+            self.counts[counter_key] = self.counts.get(counter_key, 0) + 1
+        else:
+            self.overflow_count += 1
+
+        if not self.include_key:
+            self.top_k.add(counter_key)
+            return
+
+        # 채널/target/키 카운터
+        key_counter_key = (channel, target_value, key_value)
+        if key_counter_key in self.key_counts or len(self.key_counts) < self.max_keys:
+            self.key_counts[key_counter_key] = self.key_counts.get(key_counter_key, 0) + 1
+        else:
+            self.key_overflow_count += 1
+        self.top_k.add(key_counter_key)
+
+    def to_dict(self, window_seconds: int) -> Dict:
+        """rollup 레코드로 변환합니다."""
+        fields = ('channel', 'target', 'key')
+        record = {
+            'window_start': datetime.datetime.fromtimestamp(self.start).strftime('%Y-%m-%d %H:%M:%S'),
+            'window_seconds': window_seconds,
+            'total': self.total,
+            'counts': [
+                {'channel': channel, 'target': target_value, 'count': count}
+                for (channel, target_value), count in self.counts.items()
+            ],
+            'overflow_count': self.overflow_count,
+            'top_k': [
+                dict(zip(fields, item), count=count)
+                for item, count in self.top_k.items()
+            ],
+        }
+        if self.include_key:
+            record['key_counts'] = [
+                dict(zip(fields, item), count=count)
+                for item, count in self.key_counts.items()
+            ]
+            record['key_overflow_count'] = self.key_overflow_count
+        return record
+
+
+class AggregationService:
+    """tumbling window 기반 메시지 집계 및 rollup 기록 서비스 클래스"""
+
+    def __init__(self):
+        self.logger = Logger('AggregationService')
+        self.config = Config()
+        self.window_seconds = self.config.AGGREGATION_WINDOW_SECONDS
+        self.rollup_dir = os.path.abspath(self.config.AGGREGATION_ROLLUP_DIR)
+        self.window: Optional[AggregationWindow] = None
+        self.lock = threading.Lock()
+        self.running = True
+        self.flush_thread = threading.Thread(target=self._flush_worker, daemon=True)
+        self.flush_thread.start()
+
+    def _window_start(self, timestamp: float) -> float:
+        """타임스탬프가 속한 window의 시작 시각을 반환합니다."""
+        return timestamp - (timestamp % self.window_seconds)
+
+    def record(self, channel: str, target_value: str, key_value: str):
+        """
+        메시지를 현재 window에 집계합니다.
+
+        Args:
+            channel: 채널명
+            target_value: target 필드 값
+            key_value: 키 값
+        """
+        start = self._window_start(time.time())
+        closed_window = None
+        with self.lock:
+            if self.window is not None and self.window.start != start:
+                closed_window = self.window
+                self.window = None
+            if self.window is None:
+                self.window = AggregationWindow(start, self.config)
+            self.window.add(channel, target_value, key_value)
+
+        # 파일 기록은 lock 밖에서 수행
+        if closed_window is not None:
+            self._flush_window(closed_window)
+
+    def _flush_worker(self):
+        """메시지가 없어도 닫힌 window를 기록하는 워커 스레드입니다."""
+        while self.running:
+            time.sleep(1)
+            start = self._window_start(time.time())
+            closed_window = None
+            with self.lock:
+                if self.window is not None and self.window.start != start:
+                    closed_window = self.window
+                    self.window = None
+            if closed_window is not None:
+                self._flush_window(closed_window)
+
+    def _flush_window(self, window: AggregationWindow):
+        """닫힌 window를 날짜별 rollup 파일에 기록합니다."""
+        try:
+            if not os.path.exists(self.rollup_dir):
+                os.makedirs(self.rollup_dir, exist_ok=True)
+                self.logger.info(f"rollup 디렉토리 생성: {self.rollup_dir}")
+
+            date = datetime.datetime.fromtimestamp(window.start).strftime('%Y-%m-%d')
+            rollup_file_path = os.path.join(self.rollup_dir, f'{date}.jsonl')
+            record = window.to_dict(self.window_seconds)
+
+            with open(rollup_file_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n')
+        except Exception as e:
+            self.logger.error(f"rollup 기록 중 오류: {str(e)}")
+
+    def close(self):
+        """
+        집계를 종료하고 현재 window를 기록합니다.
+
+        시그널 핸들러에서 호출되면 같은 스레드가 record() 안에서 lock을 잡고 있을 수 있으므로
+        lock은 제한 시간만 기다리고, 얻지 못하면 현재 window를 그대로 기록합니다.
+        """
+        self.running = False
+        locked = self.lock.acquire(timeout=CLOSE_LOCK_TIMEOUT_SECONDS)
+        if not locked:
+            self.logger.warning("집계 종료 중 lock 대기 시간 초과, 현재 window를 그대로 기록")
+        try:
+            window, self.window = self.window, None
+        finally:
+            if locked:
+                self.lock.release()
+
+        if window is not None:
+            self._flush_window(window)
@@ -4,19 +4,106 @@
 import os
 import json
 import datetime
-from typing import Dict, Any
+from collections import OrderedDict, namedtuple
+from logging.handlers import RotatingFileHandler
+from typing import Optional, Tuple
 from utils.logger import Logger
 from utils.filter import MessageFilter
+from utils.projection import MessageProjector
+from services.aggregation_service import AggregationService
 from config import Config
 
 
+# 메시지 준비 결과
+PREPARED = 'prepared'
+PARSE_FAILED = 'parse_failed'
+FILTERED = 'filtered'
+KEY_MISSING = 'key_missing'
+
+# 파싱/필터링을 통과하여 기록할 준비가 된 메시지
+PreparedMessage = namedtuple(
+    'PreparedMessage',
+    ['folder_path', 'log_file_path', 'log_message', 'channel', 'target_value', 'key_value']
+)
+
+
+def get_message_base_path(config: Config) -> str:
+    """메시지 로그 기본 경로를 반환합니다. (스크립트 실행 디렉토리와 상관없이 항상 유지되도록 절대 경로 사용)"""
+    return os.path.abspath(config.MESSAGE_LOG_DIR)
+
+
+def prepare_message(message_filter: MessageFilter, projector: MessageProjector, base_path: str,
+                    channel: str, message: str,
+                    timestamp: Optional[datetime.datetime] = None) -> Tuple[str, Optional[PreparedMessage]]:
+    """
+    메시지를 파싱/필터링하고 기록할 경로와 로그 라인을 만듭니다. (파일 I/O 없음)
+    
+    Args:
+        message_filter: 메시지 필터
+        projector: 채널별 출력 규칙
+        base_path: 메시지 로그 기본 경로
+        channel: 채널명
+        message: 메시지 데이터
+        timestamp: 메시지 시각 (없으면 현재 시각)
+        
+    Returns:
+        tuple: (준비 결과, PreparedMessage 또는 None)
+    """
+    # JSON 파싱 (객체가 아닌 JSON 값은 필드를 읽을 수 없으므로 파싱 실패로 처리)
+    message_data = message_filter.parse_message(message)
+    if not message_data or not isinstance(message_data, dict):
+        return PARSE_FAILED, None
+    
+    # 필터링 조건 확인
+    if not message_filter.should_process_message(message_data):
+        return FILTERED, None
+    
+    # 키 값 추출
+    key_value = message_filter.extract_key_value(message_data)
+    if not key_value:
+        return KEY_MISSING, None
+    
+    # 키 필드가 마스킹/해시 대상이면 헤더와 폴더명에도 같은 값을 사용
+    key_value = projector.project_key(channel, message_data, key_value)
+    
+    # 폴더명 정리 (Windows 호환)
+    safe_channel = message_filter.sanitize_folder_name(channel)
+    safe_key_value = message_filter.sanitize_folder_name(key_value)
+    
+    # 폴더 경로 생성
+    folder_path = os.path.join(base_path, safe_channel, safe_key_value)
+    
+    # 날짜별 로그 파일 경로
+    timestamp_text = (timestamp or datetime.datetime.now()).strftime('%Y-%m-%d %H:%M:%S')
+    log_file_path = os.path.join(folder_path, f'{timestamp_text[:10]}.log')
+    
+    # 채널별 출력 규칙 적용 (필터링/키 추출은 원본 기준)
+    output_data = projector.project(channel, message_data)
+    
+    # 한 줄 로그 메시지 생성
+    log_message = f"{timestamp_text} [{channel}/{key_value}] {json.dumps(output_data, ensure_ascii=False)}"
+    
+    target_value = message_data[message_filter.target_field]
+    return PREPARED, PreparedMessage(folder_path, log_file_path, log_message, channel, target_value, key_value)
+
+
 class MessageService:
     """메시지 처리 및 로깅 서비스 클래스"""
     
-    def __init__(self):
+    def __init__(self, live: bool = True):
+        """
+        Args:
+            live: 실시간 수신 여부 (False이면 콘솔 출력과 집계를 생략)
+        """
         self.logger = Logger('MessageService')
         self.filter = MessageFilter()
+        self.projector = MessageProjector()
         self.config = Config()
+        self.live = live
+        self.base_path = get_message_base_path(self.config)
+        self.max_bytes = self.config.LOG_FILE_SIZE_MB * 1024 * 1024
+        self.aggregator = AggregationService() if live and self.config.AGGREGATION_ENABLED else None
+        self.file_handlers = OrderedDict()
         self._ensure_log_directories()
     
     def _ensure_log_directories(self):
@@ -34,49 +121,33 @@ class MessageService:
             message: 메시지 데이터
         """
         try:
-            # JSON 파싱
-            message_data = self.filter.parse_message(message)
-            if not message_data:
-                self.logger.warning(f"JSON 파싱 실패: {message}")
-                return
-            
-            # 필터링 조건 확인
-            if not self.filter.should_process_message(message_data):
-                self.logger.debug(f"필터링 조건 불만족: {message}")
-                return
-            
-            # 키 값 추출
-            key_value = self.filter.extract_key_value(message_data)
-            if not key_value:
-                self.logger.warning(f"키 값 추출 실패: {message}")
-                return
-            
-            # 폴더명 정리 (Windows 호환)
-            safe_channel = self.filter.sanitize_folder_name(channel)
-            safe_key_value = self.filter.sanitize_folder_name(key_value)
-            
-            # 폴더 경로 생성 (절대 경로 지원)
-            message_log_dir = self.config.MESSAGE_LOG_DIR
-            
-            # 절대 경로인지 확인
-            if os.path.isabs(message_log_dir):
-                base_path = message_log_dir
+            result, prepared = prepare_message(self.filter, self.projector, self.base_path, channel, message)
+            
+            if result == PARSE_FAILED:
+                self.logger.warning("JSON 파싱 실패: %s", message)
+            elif result == FILTERED:
+                self.logger.debug("필터링 조건 불만족: %s", message)
+            elif result == KEY_MISSING:
+                self.logger.warning("키 값 추출 실패: %s", message)
             else:
-                # 스크립트 실행 디렉토리와 상관없이 항상 유지되도록 현재 작업 디렉토리 기준
-                base_path = os.path.abspath(message_log_dir)
-            
-            folder_path = os.path.join(base_path, safe_channel, safe_key_value)
-            self._ensure_folder_exists(folder_path)
-            
-            # 날짜별 로그 파일 경로
-            today = datetime.datetime.now().strftime('%Y-%m-%d')
-            log_file_path = os.path.join(folder_path, f'{today}.log')
-            
-            # 메시지 로깅
-            self._log_message(log_file_path, channel, key_value, message_data)
-            
+                self.write_message(prepared)
+        
         except Exception as e:
-            self.logger.error(f"메시지 처리 중 오류: {str(e)}")
+            self.logger.error("메시지 처리 중 오류: %s", e)
+    
+    def write_message(self, prepared: PreparedMessage):
+        """
+        준비된 메시지를 로그 파일에 기록하고 집계합니다.
+        
+        Args:
+            prepared: 준비된 메시지
+        """
+        # 메시지 로깅
+        self._log_message(prepared.folder_path, prepared.log_file_path, prepared.log_message)
+        
+        # 집계
+        if self.aggregator:
+            self.aggregator.record(prepared.channel, prepared.target_value, prepared.key_value)
     
     def _ensure_folder_exists(self, folder_path: str):
         """폴더가 존재하는지 확인하고 생성합니다."""
@@ -84,54 +155,69 @@ class MessageService:
             os.makedirs(folder_path, exist_ok=True)
             self.logger.info(f"폴더 생성: {folder_path}")
     
-    def _log_message(self, log_file_path: str, channel: str, key_value: str, message_data: Dict[str, Any]):
+    def _get_file_writer(self, folder_path: str, log_file_path: str) -> list:
+        """
+        로그 파일 경로의 [RotatingFileHandler, 현재 파일 크기]를 반환합니다.
+        
+        최근 사용한 파일을 최대 logging.max_open_files개까지 열어 두고 재사용합니다.
+        """
+        file_writer = self.file_handlers.get(log_file_path)
+        if file_writer is not None:
+            self.file_handlers.move_to_end(log_file_path)
+            return file_writer
+        
+        # 가장 오래 사용하지 않은 파일 닫기
+        while len(self.file_handlers) >= self.config.LOG_MAX_OPEN_FILES:
+            _, (oldest_handler, _) = self.file_handlers.popitem(last=False)
+            oldest_handler.close()
+        
+        self._ensure_folder_exists(folder_path)
+        file_handler = RotatingFileHandler(
+            log_file_path,
+            maxBytes=self.max_bytes,
+            backupCount=self.config.LOG_BACKUP_COUNT,
+            encoding='utf-8'
+        )
+        file_writer = [file_handler, file_handler.stream.tell()]
+        self.file_handlers[log_file_path] = file_writer
+        return file_writer
+    
+    def _log_message(self, folder_path: str, log_file_path: str, log_message: str):
         """
         메시지를 로그 파일에 기록합니다.
         
         Args:
+            folder_path: 로그 폴더 경로
             log_file_path: 로그 파일 경로
-            channel: 채널명
-            key_value: 키 값
-            message_data: 메시지 데이터
+            log_message: 한 줄 로그 메시지
         """
         try:
-            # 현재 시간
-            timestamp = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            
-            # 한 줄 로그 메시지 생성
-            log_message = f"{timestamp} [{channel}/{key_value}] {json.dumps(message_data, ensure_ascii=False)}"
-            
-            # RotatingFileHandler를 사용하여 로그 기록
-            from logging.handlers import RotatingFileHandler
-            import logging
-            
-            # 로거 생성
-            message_logger = logging.getLogger(f'message_{channel}_{key_value}')
-            message_logger.setLevel(logging.INFO)
-            
-            # 기존 핸들러 제거
-            for handler in message_logger.handlers[:]:
-                message_logger.removeHandler(handler)
-            
-            # 파일 핸들러 설정
-            file_handler = RotatingFileHandler(
-                log_file_path,
-                maxBytes=self.config.LOG_FILE_SIZE_MB * 1024 * 1024,
-                backupCount=self.config.LOG_BACKUP_COUNT,
-                encoding='utf-8'
-            )
-            file_handler.setLevel(logging.INFO)
-            
-            # 포맷터 설정 (타임스탬프 제거, 메시지만 기록)
-            formatter = logging.Formatter('%(message)s')
-            file_handler.setFormatter(formatter)
-            message_logger.addHandler(file_handler)
-            
-            # 로그 기록
-            message_logger.info(log_message)
-            
-            # 콘솔에도 출력
-            self.logger.info(log_message)
-            
+            file_writer = self._get_file_writer(folder_path, log_file_path)
+            file_handler = file_writer[0]
+            line = log_message + '\n'
+            size = len(line.encode('utf-8'))
+            
+            # 파일 크기가 log_file_size_mb를 넘으면 RotatingFileHandler로 rolling
+            if self.max_bytes and file_writer[1] > 0 and file_writer[1] + size > self.max_bytes:
+                file_handler.doRollover()
+                file_writer[1] = 0
+            
+            file_handler.stream.write(line)
+            file_writer[1] += size
+            
+            # 실시간 수신 시에는 즉시 flush하고 콘솔에도 출력 (재처리 시에는 파일을 닫을 때 flush)
+            if self.live:
+                file_handler.flush()
+                self.logger.info(log_message)
+        
         except Exception as e:
-            self.logger.error(f"로그 기록 중 오류: {str(e)}")
+            self.logger.error("로그 기록 중 오류: %s", e)
+    
+    def close(self):
+        """메시지 서비스를 종료합니다."""
+        if self.aggregator:
+            self.aggregator.close()
+        
+        while self.file_handlers:
+            _, (file_handler, _) = self.file_handlers.popitem()
+            file_handler.close()
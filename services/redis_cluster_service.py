@@ -0,0 +1,307 @@
+"""
+Redis Cluster 샤드 PubSub 서비스 모듈
+"""
+import redis
+import time
+import queue
+import threading
+from typing import Callable, Dict, List, Set, Tuple
+from redis.cluster import RedisCluster, ClusterNode
+from redis.exceptions import RedisClusterException
+from services.redis_service import RedisService
+
+
+# 실패한 리더를 다시 시작하기 전 대기 시간 (초)
+READER_RESTART_DELAY_SECONDS = 1.0
+
+
+class ShardReader:
+    """
+    하나의 primary 노드에서 샤드 채널을 SSUBSCRIBE하는 리더 스레드 클래스
+    
+    담당 채널이 바뀌면 리더를 다시 만들지 않고 같은 연결에서 SSUBSCRIBE/SUNSUBSCRIBE로 조정하므로,
+    한 노드에 대해 두 리더가 동시에 구독하여 메시지가 중복되지 않습니다.
+    """
+    
+    def __init__(self, service: 'RedisClusterService', node_name: str, host: str, port: int, channels: Tuple[str, ...]):
+        self.service = service
+        self.node_name = node_name
+        self.host = host
+        self.port = port
+        self.channels = channels
+        self.lock = threading.Lock()
+        self.subscribed: Set[str] = set()
+        self.unsubscribing: Set[str] = set()
+        self.stop_event = threading.Event()
+        self.done = threading.Event()
+        self.thread = threading.Thread(target=self._worker, daemon=True)
+    
+    def start(self):
+        """리더 스레드를 시작합니다."""
+        self.thread.start()
+    
+    def stop(self):
+        """리더 스레드 종료를 요청합니다."""
+        self.stop_event.set()
+    
+    def update_channels(self, channels: Tuple[str, ...]):
+        """담당 채널을 변경합니다. (리더 스레드가 다음 루프에서 구독을 조정)"""
+        with self.lock:
+            self.channels = channels
+    
+    def _sync_subscriptions(self, pubsub: redis.client.PubSub):
+        """담당 채널과 현재 구독 채널의 차이만큼 구독/구독 해제합니다."""
+        with self.lock:
+            channels = set(self.channels)
+        
+        removed = self.subscribed - channels
+        if removed:
+            self.unsubscribing |= removed
+            pubsub.sunsubscribe(*removed)
+            self.subscribed -= removed
+            self.service.logger.info(f"샤드 채널 구독 해제: {self.node_name} {sorted(removed)}")
+        
+        added = channels - self.subscribed
+        if added:
+            pubsub.ssubscribe(*added)
+            self.subscribed |= added
+            self.service.logger.info(f"샤드 채널 구독 시작: {self.node_name} {sorted(added)}")
+    
+    def _enqueue(self, item: Tuple[str, str]):
+        """공용 큐에 메시지를 넣습니다. (큐가 가득 차도 종료 요청은 확인)"""
+        while not self.stop_event.is_set():
+            try:
+                self.service.message_queue.put(item, timeout=1.0)
+                return
+            except queue.Full:
+                continue
+    
+    def _worker(self):
+        """샤드 메시지를 수신하여 공용 큐에 넣는 워커 스레드입니다."""
+        logger = self.service.logger
+        client = None
+        pubsub = None
+        failed = False
+        try:
+            client = redis.Redis(host=self.host, port=self.port, **self.service.get_node_config())
+            pubsub = client.pubsub()
+            
+            while not self.stop_event.is_set():
+                self._sync_subscriptions(pubsub)
+                
+                message = pubsub.get_message(timeout=1.0)
+                if message is None:
+                    continue
+                
+                if message['type'] == 'smessage':
+                    try:
+                        channel = message['channel'].decode('utf-8')
+                        data = message['data'].decode('utf-8')
+                    except UnicodeDecodeError as e:
+                        # 잘못된 메시지 하나 때문에 리더가 종료되지 않도록 건너뜀
+                        logger.warning(f"UTF-8이 아닌 샤드 메시지 무시: {self.node_name} {str(e)}")
+                        continue
+                    self._enqueue((channel, data))
+                elif message['type'] == 'sunsubscribe':
+                    channel = message['channel'].decode('utf-8')
+                    if channel in self.unsubscribing:
+                        self.unsubscribing.discard(channel)
+                        continue
+                    # slot 이전 등으로 서버가 구독을 해제한 경우 토폴로지 재확인 후 다시 배정
+                    logger.info(f"샤드 채널 구독 해제됨: {self.node_name} {channel}")
+                    self.subscribed.discard(channel)
+                    with self.lock:
+                        self.channels = tuple(name for name in self.channels if name != channel)
+                    self.service.request_rebalance()
+        
+        except redis.ResponseError as e:
+            # MOVED 등 slot 소유 노드 변경
+            logger.info(f"샤드 구독 리다이렉트: {self.node_name} {str(e)}")
+            failed = True
+        except Exception as e:
+            # 예상하지 못한 오류도 리더 종료로 처리하여 토폴로지 재확인 후 다시 시작
+            logger.error(f"샤드 리더 오류: {self.node_name} {str(e)}")
+            failed = True
+        finally:
+            try:
+                if pubsub:
+                    pubsub.close()
+                if client:
+                    client.close()
+            except Exception as e:
+                logger.error(f"샤드 리더 종료 중 오류: {self.node_name} {str(e)}")
+            
+            # 연결을 닫은 뒤에 종료를 알려야 재시작한 리더와 구독이 겹치지 않음
+            self.done.set()
+            if failed and not self.stop_event.is_set():
+                # 연결 거부 등으로 재시작이 반복되지 않도록 잠시 후 재확인
+                self.service.request_rebalance(READER_RESTART_DELAY_SECONDS)
+
+
+class RedisClusterService(RedisService):
+    """Redis Cluster 토폴로지를 따라 샤드 채널을 노드별로 구독하는 서비스 클래스"""
+    
+    def __init__(self):
+        self.cluster = None
+        self.readers: Dict[str, ShardReader] = {}
+        self.rebalance_event = threading.Event()
+        self.rebalance_at = 0.0
+        self.message_queue = None
+        super().__init__()
+        self.message_queue = queue.Queue(maxsize=self.config.REDIS_CLUSTER_QUEUE_SIZE)
+    
+    def get_node_config(self) -> dict:
+        """노드 연결에 사용할 설정을 반환합니다. (host/port/db 제외)"""
+        return {
+            key: value for key, value in self.config.get_redis_config().items()
+            if key not in ('host', 'port', 'db')
+        }
+    
+    def _connect(self):
+        """Redis Cluster에 연결하고 토폴로지를 조회합니다."""
+        try:
+            startup_nodes = [
+                ClusterNode(*node.rsplit(':', 1)) for node in self.config.REDIS_CLUSTER_STARTUP_NODES
+            ] or [ClusterNode(self.config.REDIS_HOST, self.config.REDIS_PORT)]
+            
+            self.cluster = RedisCluster(startup_nodes=startup_nodes, **self.get_node_config())
+            primaries = [node.name for node in self.cluster.get_primaries()]
+            self.logger.info(f"Redis Cluster 연결 성공: primary {primaries}")
+        except Exception as e:
+            self.logger.error(f"Redis Cluster 연결 실패: {str(e)}")
+            raise
+    
+    def subscribe_all_channels(self):
+        """설정된 샤드 채널을 소유 primary 노드별로 구독합니다."""
+        if not self.config.REDIS_CLUSTER_SHARD_CHANNELS:
+            self.logger.error("채널 구독 실패: redis.cluster.shard_channels가 비어 있습니다.")
+            raise ValueError("redis.cluster.shard_channels가 비어 있습니다.")
+        
+        self._rebalance()
+        self.logger.info("샤드 채널 구독 시작")
+    
+    def request_rebalance(self, delay: float = 0.0):
+        """
+        토폴로지 재확인을 요청합니다. (수신 스레드가 delay초 이후에 수행)
+        
+        Args:
+            delay: 재확인까지 최소 대기 시간 (초)
+        """
+        if delay:
+            self.rebalance_at = max(self.rebalance_at, time.time() + delay)
+        self.rebalance_event.set()
+    
+    def _assign_channels(self) -> Dict[str, Tuple[str, int, Tuple[str, ...]]]:
+        """샤드 채널을 slot 소유 primary 노드별로 묶습니다."""
+        assignment: Dict[str, Tuple[str, int, List[str]]] = {}
+        for channel in self.config.REDIS_CLUSTER_SHARD_CHANNELS:
+            node = self.cluster.get_node_from_key(channel)
+            assignment.setdefault(node.name, (node.host, node.port, []))[2].append(channel)
+        
+        return {
+            node_name: (host, port, tuple(sorted(channels)))
+            for node_name, (host, port, channels) in assignment.items()
+        }
+    
+    def _rebalance(self):
+        """토폴로지를 다시 조회하고 노드별 리더 스레드를 맞춥니다."""
+        self.rebalance_event.clear()
+        
+        try:
+            self.cluster.nodes_manager.initialize()
+            assignment = self._assign_channels()
+        except (redis.RedisError, RedisClusterException) as e:
+            # 토폴로지 조회 실패 시 exponential backoff 후 재시도 (대기 중에도 수신 큐는 계속 처리)
+            self.reconnect_attempts += 1
+            delay = self._calculate_backoff_delay()
+            self.logger.error(f"Redis Cluster 토폴로지 조회 실패: {str(e)} (재시도 대기 {delay:.2f}초)")
+            self.request_rebalance(delay)
+            return
+        
+        self.reconnect_attempts = 0
+        
+        # 리더 정리: 종료된 리더는 제거 후 재시작, 담당 채널이 바뀐 리더는 구독만 조정
+        for node_name, reader in list(self.readers.items()):
+            target = assignment.get(node_name)
+            if reader.done.is_set():
+                del self.readers[node_name]
+            elif reader.stop_event.is_set():
+                # 종료 중인 리더가 끝난 뒤에 같은 노드의 리더를 시작하도록 다시 확인
+                if target is not None:
+                    self.request_rebalance(READER_RESTART_DELAY_SECONDS)
+            elif target is None:
+                reader.stop()
+            elif target[2] != reader.channels:
+                reader.update_channels(target[2])
+        
+        # 새 리더 시작
+        for node_name, (host, port, channels) in assignment.items():
+            if node_name not in self.readers:
+                reader = ShardReader(self, node_name, host, port, channels)
+                self.readers[node_name] = reader
+                reader.start()
+    
+    def listen_messages(self, message_handler: Callable):
+        """
+        모든 샤드 리더의 메시지를 하나의 처리 파이프라인으로 전달합니다.
+        
+        Args:
+            message_handler: 메시지 처리 함수
+        """
+        try:
+            self.running = True
+            self.logger.info("메시지 수신 대기 중...")
+            
+            # Heartbeat 스레드 시작
+            if self.config.HEARTBEAT_ENABLED:
+                self._start_heartbeat()
+            
+            refresh_interval = self.config.REDIS_CLUSTER_TOPOLOGY_REFRESH_SECONDS
+            next_refresh = time.time() + refresh_interval
+            
+            while self.running:
+                # 리더 요청 또는 주기적으로 토폴로지 재확인 (재시도 대기 시각 이전에는 수행하지 않음)
+                now = time.time()
+                if now >= self.rebalance_at and (
+                    self.rebalance_event.is_set() or (refresh_interval and now >= next_refresh)
+                ):
+                    self._rebalance()
+                    next_refresh = time.time() + refresh_interval
+                
+                try:
+                    channel, data = self.message_queue.get(timeout=1.0)
+                except queue.Empty:
+                    continue
+                
+                # 마지막 메시지 수신 시간 업데이트
+                self.last_message_time = time.time()
+                
+                self.logger.debug(f"메시지 수신: 채널={channel}, 데이터={data}")
+                
+                # 메시지 핸들러 호출
+                message_handler(channel, data)
+        
+        except Exception as e:
+            self.logger.error(f"메시지 수신 중 오류: {str(e)}")
+            raise
+        finally:
+            self.running = False
+            if self.heartbeat_thread:
+                self.heartbeat_thread.join()
+    
+    def close(self):
+        """모든 샤드 리더와 Redis Cluster 연결을 종료합니다."""
+        try:
+            self.running = False
+            for reader in self.readers.values():
+                reader.stop()
+            for reader in self.readers.values():
+                reader.thread.join(timeout=2.0)
+            self.readers.clear()
+            
+            if self.cluster:
+                self.cluster.close()
+            
+            self.logger.info("Redis Cluster 연결 종료")
+        except Exception as e:
+            self.logger.error(f"Redis Cluster 연결 종료 중 오류: {str(e)}")
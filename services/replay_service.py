@@ -0,0 +1,255 @@
+"""
+오프라인 재처리(replay) 서비스 모듈
+
+NDJSON, 기존 메시지 로그 라인, gzip 입력을 실시간 수신과 같은 파싱/필터링/기록 파이프라인으로 처리합니다.
+파싱/필터링은 워커 프로세스에서 배치 단위로 수행하고, 파일 기록은 메인 프로세스에서 입력 순서대로 수행합니다.
+"""
+import os
+import re
+import sys
+import gzip
+import time
+import datetime
+import multiprocessing
+from collections import deque
+from typing import Dict, Iterator, List, Optional, Tuple, BinaryIO
+from utils.logger import Logger
+from utils.filter import MessageFilter
+from utils.projection import MessageProjector
+from services.message_service import (
+    MessageService, PreparedMessage, prepare_message, get_message_base_path, PREPARED
+)
+from config import Config
+
+
+# 기존 메시지 로그 라인 형식: "yyyy-mm-dd HH:MM:SS [channel/key] {json}"
+LOG_LINE_PATTERN = re.compile(r'^(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}) \[(.*?)\] (\{.*)$')
+
+# spill 파일 형식: {"channel": ..., "message": ...}
+ENVELOPE_PREFIX = '{"channel": '
+ENVELOPE_KEYS = {'channel', 'message'}
+
+# 잘못된 입력 라인
+INVALID_LINE = 'invalid_line'
+
+# 처리 중 예외가 발생한 라인
+PROCESS_ERROR = 'process_error'
+
+_worker_filter: Optional[MessageFilter] = None
+_worker_projector: Optional[MessageProjector] = None
+_worker_base_path: Optional[str] = None
+_worker_channel: Optional[str] = None
+
+
+def _init_worker(default_channel: str):
+    """워커 프로세스를 초기화합니다."""
+    global _worker_filter, _worker_projector, _worker_base_path, _worker_channel
+    _worker_filter = MessageFilter()
+    _worker_projector = MessageProjector()
+    _worker_base_path = get_message_base_path(_worker_filter.config)
+    _worker_channel = default_channel
+
+
+def _parse_line(line: str, default_channel: str) -> Optional[Tuple[str, str, Optional[datetime.datetime]]]:
+    """
+    입력 라인에서 채널명, 메시지, 시각을 추출합니다.
+    
+    Returns:
+        tuple: (채널명, 메시지, 시각) (형식이 잘못되면 None)
+    """
+    # 키가 정확히 channel, message인 경우에만 spill 레코드로 처리 (일반 메시지의 channel 필드와 구분)
+    if line.startswith(ENVELOPE_PREFIX):
+        envelope = _worker_filter.parse_message(line)
+        if isinstance(envelope, dict) and envelope.keys() == ENVELOPE_KEYS and isinstance(envelope['message'], str):
+            return str(envelope['channel']), envelope['message'], None
+    
+    if line.startswith('{'):
+        return default_channel, line, None
+    
+    match = LOG_LINE_PATTERN.match(line)
+    if not match:
+        return None
+    
+    # 키에 '/'가 있을 수 있으므로 헤더의 "channel/key"에서 본문의 키 값(기록 시와 같은 값)을 떼어 채널명으로 사용
+    timestamp = datetime.datetime.strptime(match.group(1), '%Y-%m-%d %H:%M:%S')
+    header = match.group(2)
+    message_data = _worker_filter.parse_message(match.group(3))
+    key_value = _worker_filter.extract_key_value(message_data) if isinstance(message_data, dict) else None
+    if key_value is None:
+        # 본문에서 키를 읽을 수 없으면 파싱 실패/키 없음으로 집계되므로 마지막 '/' 앞부분을 채널명으로 사용
+        channel = header.rsplit('/', 1)[0]
+    elif header.endswith('/' + key_value):
+        channel = header[:-len(key_value) - 1]
+    else:
+        return None
+    return channel, match.group(3), timestamp
+
+
+def _prepare_batch(lines: List[bytes]) -> Tuple[List[PreparedMessage], Dict[str, int]]:
+    """
+    입력 라인 배치를 파싱/필터링합니다. (워커 프로세스에서 실행)
+    
+    Returns:
+        tuple: (기록할 메시지 목록, 결과별 건수)
+    """
+    prepared_messages = []
+    counts: Dict[str, int] = {}
+    
+    for raw_line in lines:
+        line = raw_line.decode('utf-8', errors='replace').strip()
+        if not line:
+            continue
+        
+        parsed = _parse_line(line, _worker_channel)
+        if parsed is None:
+            counts[INVALID_LINE] = counts.get(INVALID_LINE, 0) + 1
+            continue
+        
+        # 한 라인의 오류로 전체 재처리가 중단되지 않도록 라인 단위로 처리
+        try:
+            result, prepared = prepare_message(_worker_filter, _worker_projector, _worker_base_path, *parsed)
+        except Exception:
+            counts[PROCESS_ERROR] = counts.get(PROCESS_ERROR, 0) + 1
+            continue
+        counts[result] = counts.get(result, 0) + 1
+        if prepared:
+            prepared_messages.append(prepared)
+    
+    return prepared_messages, counts
+
+
+class ReplayService:
+    """파일/디렉토리/표준 입력의 메시지를 일괄 재처리하는 서비스 클래스"""
+    
+    def __init__(self, input_path: str, workers: int, batch_size: int, default_channel: str):
+        self.logger = Logger('ReplayService')
+        self.config = Config()
+        self.input_path = input_path
+        self.workers = max(1, workers)
+        self.batch_size = batch_size
+        self.default_channel = default_channel
+        self.output_path = os.path.realpath(get_message_base_path(self.config))
+        self.counts: Dict[str, int] = {}
+        self.bytes_read = 0
+        self.lines_read = 0
+        self.start_time = 0.0
+        self.last_progress_time = 0.0
+    
+    def is_message_output(self, path: str) -> bool:
+        """경로가 메시지 로그 출력 디렉토리 안에 있는지 확인합니다."""
+        real_path = os.path.realpath(path)
+        return real_path == self.output_path or real_path.startswith(self.output_path + os.sep)
+    
+    def _iter_input_files(self) -> Iterator[str]:
+        """
+        입력 파일 경로를 순서대로 반환합니다.
+        
+        재처리 결과가 기록되는 메시지 로그 출력 디렉토리는 읽지 않습니다.
+        (기록 중인 파일을 다시 읽어 입력이 끝나지 않는 것을 방지)
+        """
+        if self.input_path != '-' and self.is_message_output(self.input_path):
+            self.logger.error(f"메시지 로그 출력 디렉토리 안의 입력은 재처리할 수 없음: {self.input_path}")
+            return
+        
+        if self.input_path == '-' or not os.path.isdir(self.input_path):
+            yield self.input_path
+            return
+        
+        for root, dirs, files in os.walk(self.input_path):
+            if self.is_message_output(root):
+                self.logger.warning(f"메시지 로그 출력 디렉토리 제외: {root}")
+                dirs.clear()
+                continue
+            dirs.sort()
+            for name in sorted(files):
+                yield os.path.join(root, name)
+    
+    def _open_input(self, path: str) -> BinaryIO:
+        """입력을 바이너리 모드로 엽니다. (gzip은 자동 감지)"""
+        stream = sys.stdin.buffer if path == '-' else open(path, 'rb')
+        if stream.peek(2)[:2] == b'\x1f\x8b':
+            return gzip.GzipFile(fileobj=stream)
+        return stream
+    
+    def _iter_batches(self) -> Iterator[List[bytes]]:
+        """입력 라인을 batch_size 단위로 읽습니다. (파일 전체를 메모리에 올리지 않음)"""
+        batch = []
+        for path in self._iter_input_files():
+            self.logger.info(f"재처리 입력: {path}")
+            try:
+                stream = self._open_input(path)
+                try:
+                    for line in stream:
+                        self.bytes_read += len(line)
+                        batch.append(line)
+                        if len(batch) >= self.batch_size:
+                            yield batch
+                            batch = []
+                finally:
+                    if path != '-':
+                        stream.close()
+            except (OSError, EOFError) as e:
+                self.logger.error(f"입력 읽기 실패: {path}: {str(e)}")
+        if batch:
+            yield batch
+    
+    def _write_results(self, message_service: MessageService, lines: int,
+                       result: Tuple[List[PreparedMessage], Dict[str, int]]):
+        """워커 결과를 기록하고 통계를 갱신합니다."""
+        prepared_messages, counts = result
+        for prepared in prepared_messages:
+            message_service.write_message(prepared)
+        
+        self.lines_read += lines
+        for name, count in counts.items():
+            self.counts[name] = self.counts.get(name, 0) + count
+        
+        now = time.time()
+        if now - self.last_progress_time >= self.config.REPLAY_PROGRESS_INTERVAL_SECONDS:
+            self.last_progress_time = now
+            self._report_progress(now)
+    
+    def _report_progress(self, now: float, done: bool = False):
+        """진행 상황과 처리량을 출력합니다."""
+        elapsed = max(now - self.start_time, 1e-9)
+        written = self.counts.get(PREPARED, 0)
+        self.logger.info(
+            f"재처리 {'완료' if done else '진행'}: 라인 {self.lines_read}건, 기록 {written}건, "
+            f"{self.bytes_read / 1024 / 1024:.1f}MB, "
+            f"{self.lines_read / elapsed:.0f} lines/s, {self.bytes_read / 1024 / 1024 / elapsed:.1f}MB/s, "
+            f"결과별 건수 {self.counts}"
+        )
+    
+    def run(self):
+        """재처리를 실행합니다."""
+        self.start_time = self.last_progress_time = time.time()
+        message_service = MessageService(live=False)
+        
+        try:
+            if self.workers == 1:
+                _init_worker(self.default_channel)
+                for batch in self._iter_batches():
+                    self._write_results(message_service, len(batch), _prepare_batch(batch))
+            else:
+                self._run_parallel(message_service)
+        finally:
+            message_service.close()
+        
+        self._report_progress(time.time(), done=True)
+    
+    def _run_parallel(self, message_service: MessageService):
+        """워커 프로세스로 배치를 병렬 파싱하고 입력 순서대로 기록합니다."""
+        # 읽기가 처리보다 앞서 나가지 않도록 처리 중인 배치 수를 제한
+        max_in_flight = self.workers * 2
+        in_flight = deque()
+        
+        with multiprocessing.Pool(self.workers, initializer=_init_worker, initargs=(self.default_channel,)) as pool:
+            for batch in self._iter_batches():
+                in_flight.append((len(batch), pool.apply_async(_prepare_batch, (batch,))))
+                if len(in_flight) >= max_in_flight:
+                    lines, async_result = in_flight.popleft()
+                    self._write_results(message_service, lines, async_result.get())
+            
+            while in_flight:
+                lines, async_result = in_flight.popleft()
+                self._write_results(message_service, lines, async_result.get())
@@ -0,0 +1,318 @@
+"""
+채널별 공정 스케줄링 서비스 모듈
+"""
+import os
+import json
+import time
+import random
+import fnmatch
+import datetime
+import threading
+from collections import deque
+from typing import Callable, Dict, Any
+from utils.logger import Logger
+from config import Config
+
+
+# 지원하는 overflow 처리 방식
+OVERFLOW_ACTIONS = ('drop', 'sample', 'spill')
+
+
+def _is_positive_number(value: Any) -> bool:
+    """0보다 큰 숫자인지 확인합니다."""
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and value > 0
+
+
+class TokenBucket:
+    """
+    초당 허용량 기반 토큰 버킷 클래스 (버스트 허용량 = 1초 분량)
+
+    1초 분량보다 큰 요청(초당 1건 미만 quota, 초당 bytes보다 큰 메시지)도 통과할 수 있도록
+    요청량만큼은 토큰이 쌓일 수 있습니다.
+    """
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self.tokens = rate
+        self.updated = time.monotonic()
+
+    def consume(self, amount: float) -> bool:
+        """토큰을 소비하고 허용 여부를 반환합니다."""
+        now = time.monotonic()
+        capacity = max(self.rate, amount)
+        self.tokens = min(capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens < amount:
+            return False
+        self.tokens -= amount
+        return True
+
+
+class ChannelQueue:
+    """채널별 대기열 및 통계 클래스"""
+
+    def __init__(self, policy: Dict[str, Any]):
+        self.queue = deque()
+        self.weight = policy['weight']
+        self.overflow_action = policy['overflow_action']
+        self.sample_rate = policy['sample_rate']
+        self.deficit = 0
+        self.message_bucket = TokenBucket(policy['max_messages_per_second']) if policy['max_messages_per_second'] else None
+        self.byte_bucket = TokenBucket(policy['max_bytes_per_second']) if policy['max_bytes_per_second'] else None
+        self.processed = 0
+        self.dropped = 0
+        self.sampled = 0
+        self.spilled = 0
+        self.max_lag = 0.0
+        self.last_seen = time.time()
+
+    def within_quota(self, size: int) -> bool:
+        """채널 quota 이내인지 확인합니다."""
+        if self.message_bucket and not self.message_bucket.consume(1):
+            return False
+        if self.byte_bucket and not self.byte_bucket.consume(size):
+            return False
+        return True
+
+    def lag(self, now: float) -> float:
+        """가장 오래 대기 중인 메시지의 대기 시간(초)을 반환합니다."""
+        return now - self.queue[0][0] if self.queue else 0.0
+
+
+class SchedulerService:
+    """채널별 대기열을 deficit round-robin으로 처리하는 스케줄링 서비스 클래스"""
+
+    def __init__(self, message_handler: Callable):
+        self.logger = Logger('SchedulerService')
+        self.config = Config()
+        self.message_handler = message_handler
+        self.quantum = self.config.SCHEDULING_QUANTUM_BYTES
+        if not _is_positive_number(self.quantum):
+            self.logger.warning(f"잘못된 quantum_bytes '{self.quantum}', 65536으로 처리")
+            self.quantum = 65536
+        self.max_queue_size = self.config.SCHEDULING_MAX_QUEUE_SIZE
+        self.spill_dir = os.path.abspath(self.config.SCHEDULING_SPILL_DIR)
+        self.channels: Dict[str, ChannelQueue] = {}
+        self.idle_seconds = self.config.SCHEDULING_IDLE_CHANNEL_SECONDS
+        self.next_eviction = time.time() + self.idle_seconds
+        self.active = deque()
+        self.current_channel = None
+        self.condition = threading.Condition()
+        self.spill_file = None
+        self.spill_date = None
+        self.running = True
+        self.drain_deadline = None
+        self.worker_thread = threading.Thread(target=self._worker, daemon=True)
+        self.worker_thread.start()
+        self.stats_thread = None
+        if self.config.SCHEDULING_STATS_INTERVAL_SECONDS:
+            self.stats_thread = threading.Thread(target=self._stats_worker, daemon=True)
+            self.stats_thread.start()
+
+    def _get_channel_policy(self, channel: str) -> Dict[str, Any]:
+        """채널에 적용할 정책을 반환합니다. (첫 번째로 일치하는 패턴 정책 + 기본 정책)"""
+        policy = {
+            'weight': 1,
+            'max_messages_per_second': None,
+            'max_bytes_per_second': None,
+            'overflow_action': 'drop',
+            'sample_rate': 0.1,
+        }
+        policy.update(self.config.SCHEDULING_DEFAULT_POLICY)
+        for pattern, channel_policy in self.config.SCHEDULING_CHANNEL_POLICIES.items():
+            if fnmatch.fnmatchcase(channel, pattern):
+                policy.update(channel_policy)
+                break
+
+        if policy['overflow_action'] not in OVERFLOW_ACTIONS:
+            self.logger.warning(f"알 수 없는 overflow_action '{policy['overflow_action']}' (채널={channel}), drop으로 처리")
+            policy['overflow_action'] = 'drop'
+        if not _is_positive_number(policy['weight']):
+            self.logger.warning(f"잘못된 weight '{policy['weight']}' (채널={channel}), 1로 처리")
+            policy['weight'] = 1
+        for name in ('max_messages_per_second', 'max_bytes_per_second'):
+            if policy[name] is not None and not _is_positive_number(policy[name]):
+                self.logger.warning(f"잘못된 {name} '{policy[name]}' (채널={channel}), 제한 없음으로 처리")
+                policy[name] = None
+        return policy
+
+    def _get_channel_queue(self, channel: str) -> ChannelQueue:
+        """채널 대기열을 반환합니다. (없으면 생성)"""
+        channel_queue = self.channels.get(channel)
+        if channel_queue is None:
+            channel_queue = ChannelQueue(self._get_channel_policy(channel))
+            self.channels[channel] = channel_queue
+        return channel_queue
+
+    def _evict_idle_channels(self, now: float):
+        """대기열이 비어 있고 idle_channel_seconds 동안 메시지가 없던 채널 상태를 제거합니다."""
+        idle_channels = [
+            channel for channel, channel_queue in self.channels.items()
+            if not channel_queue.queue and now - channel_queue.last_seen >= self.idle_seconds
+        ]
+        for channel in idle_channels:
+            del self.channels[channel]
+        self.next_eviction = now + self.idle_seconds
+
+    def submit(self, channel: str, message: str):
+        """
+        메시지를 채널 대기열에 추가합니다.
+
+        quota 초과 또는 대기열이 가득 찬 경우 채널의 overflow_action을 적용합니다.
+
+        Args:
+            channel: 채널명
+            message: 메시지 데이터
+        """
+        size = len(message.encode('utf-8'))
+        now = time.time()
+        with self.condition:
+            if self.idle_seconds and now >= self.next_eviction:
+                self._evict_idle_channels(now)
+            channel_queue = self._get_channel_queue(channel)
+            channel_queue.last_seen = now
+            queue_full = len(channel_queue.queue) >= self.max_queue_size
+
+            if queue_full or not channel_queue.within_quota(size):
+                action = channel_queue.overflow_action
+                if action == 'spill':
+                    channel_queue.spilled += 1
+                    self._spill(channel, message)
+                    return
+                if action == 'drop' or queue_full or random.random() >= channel_queue.sample_rate:
+                    channel_queue.dropped += 1
+                    return
+                channel_queue.sampled += 1
+
+            if not channel_queue.queue:
+                self.active.append(channel)
+            channel_queue.queue.append((now, message, size))
+            self.condition.notify()
+
+    def _spill(self, channel: str, message: str):
+        """처리하지 못한 메시지를 날짜별 spill 파일에 기록합니다."""
+        try:
+            today = datetime.datetime.now().strftime('%Y-%m-%d')
+            if self.spill_date != today:
+                if self.spill_file:
+                    self.spill_file.close()
+                os.makedirs(self.spill_dir, exist_ok=True)
+                self.spill_file = open(os.path.join(self.spill_dir, f'{today}.jsonl'), 'a', encoding='utf-8')
+                self.spill_date = today
+            self.spill_file.write(json.dumps({'channel': channel, 'message': message}, ensure_ascii=False) + '\n')
+        except Exception as e:
+            self.logger.error(f"spill 기록 중 오류: {str(e)}")
+
+    def _next_message(self):
+        """
+        deficit round-robin으로 다음 처리할 메시지를 하나 꺼냅니다.
+
+        메시지는 처리 직전에 하나씩 꺼내므로 depth/lag에는 처리 중인 메시지 외에는 모두 포함되고,
+        processed와 max_lag는 실제로 처리를 시작하는 시점에 반영됩니다.
+        """
+        while True:
+            channel = self.active[0]
+            channel_queue = self.channels[channel]
+            if self.current_channel != channel:
+                # 채널 차례가 시작될 때 weight * quantum만큼 deficit 추가
+                self.current_channel = channel
+                channel_queue.deficit += channel_queue.weight * self.quantum
+            if channel_queue.queue[0][2] <= channel_queue.deficit:
+                break
+            # deficit이 부족하면 다음 채널로 차례를 넘김
+            self.active.rotate(-1)
+            self.current_channel = None
+
+        entry = channel_queue.queue.popleft()
+        channel_queue.deficit -= entry[2]
+        if not channel_queue.queue:
+            self.active.popleft()
+            self.current_channel = None
+            channel_queue.deficit = 0
+        channel_queue.processed += 1
+        channel_queue.max_lag = max(channel_queue.max_lag, time.time() - entry[0])
+        return channel, entry[1]
+
+    def _worker(self):
+        """대기열 메시지를 처리하는 워커 스레드입니다."""
+        while True:
+            with self.condition:
+                while self.running and not self.active:
+                    self.condition.wait()
+                # 종료 시에는 대기열이 비거나 drain 제한 시간이 지날 때까지 계속 처리
+                if not self.active or (not self.running and time.time() >= self.drain_deadline):
+                    break
+                channel, message = self._next_message()
+
+            try:
+                self.message_handler(channel, message)
+            except Exception as e:
+                self.logger.error(f"메시지 처리 중 오류: {str(e)}")
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        채널별 대기열 통계를 반환합니다.
+
+        Returns:
+            Dict: 채널명 -> {depth, lag, max_lag, processed, dropped, sampled, spilled}
+        """
+        now = time.time()
+        with self.condition:
+            return {
+                channel: {
+                    'depth': len(channel_queue.queue),
+                    'lag': round(channel_queue.lag(now), 3),
+                    'max_lag': round(channel_queue.max_lag, 3),
+                    'processed': channel_queue.processed,
+                    'dropped': channel_queue.dropped,
+                    'sampled': channel_queue.sampled,
+                    'spilled': channel_queue.spilled,
+                }
+                for channel, channel_queue in self.channels.items()
+            }
+
+    def _stats_worker(self):
+        """채널별 통계를 주기적으로 기록하는 워커 스레드입니다."""
+        while self.running:
+            time.sleep(self.config.SCHEDULING_STATS_INTERVAL_SECONDS)
+            if not self.running:
+                break
+            stats = self.get_stats()
+            if stats:
+                self.logger.info(f"채널별 스케줄링 통계: {json.dumps(stats, ensure_ascii=False)}")
+            with self.condition:
+                for channel_queue in self.channels.values():
+                    channel_queue.max_lag = 0.0
+
+    def close(self):
+        """
+        스케줄러를 종료합니다.
+
+        대기 중인 메시지는 shutdown_timeout_seconds 동안 계속 처리하고,
+        그때까지 처리하지 못한 메시지는 spill 파일에 기록합니다.
+        """
+        timeout = self.config.SCHEDULING_SHUTDOWN_TIMEOUT_SECONDS
+        with self.condition:
+            self.drain_deadline = time.time() + timeout
+            self.running = False
+            self.condition.notify_all()
+        # 처리 중인 메시지 하나가 끝날 시간을 추가로 대기
+        self.worker_thread.join(timeout + 1.0)
+        if self.worker_thread.is_alive():
+            self.logger.warning("스케줄러 워커가 종료 시간 내에 끝나지 않음")
+
+        with self.condition:
+            remaining = 0
+            for channel, channel_queue in self.channels.items():
+                while channel_queue.queue:
+                    _, message, _ = channel_queue.queue.popleft()
+                    channel_queue.spilled += 1
+                    remaining += 1
+                    self._spill(channel, message)
+            self.active.clear()
+            self.current_channel = None
+            if self.spill_file:
+                self.spill_file.close()
+                self.spill_file = None
+        if remaining:
+            self.logger.warning(f"종료 시간 내에 처리하지 못한 대기 메시지 {remaining}건을 spill 파일에 기록")
@@ -1,13 +1,187 @@
 """
 로깅 유틸리티 모듈
+
+모든 Logger는 공용 QueueHandler로 로그 레코드를 넣기만 하고,
+포맷팅과 콘솔/파일 기록은 백그라운드 QueueListener 스레드에서 수행합니다.
 """
 import os
+import time
+import queue
+import atexit
 import logging
-from logging.handlers import RotatingFileHandler
-from typing import Optional
+import threading
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
+from typing import Dict, List, Optional
 from config import Config
 
 
+class DroppingQueueHandler(QueueHandler):
+    """
+    호출 스레드를 막지 않는 QueueHandler (큐가 가득 차면 레코드를 버림)
+    
+    큐의 마지막 10%는 WARNING 이상 레코드용으로 남겨 두어,
+    메시지 로그 출력(INFO)이 몰려도 경고/오류 로그는 버려지지 않도록 합니다.
+    """
+    
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.info_limit = log_queue.maxsize - max(1, log_queue.maxsize // 10) if log_queue.maxsize > 0 else 0
+        self.dropped = 0
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # 같은 프로세스 내 큐이므로 포맷팅을 리스너 스레드로 미룸
+        return record
+    
+    def enqueue(self, record: logging.LogRecord):
+        if self.info_limit and record.levelno < logging.WARNING and self.queue.qsize() >= self.info_limit:
+            self.dropped += 1
+            return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class CoalescingQueueListener(QueueListener):
+    """
+    로거 이름별 핸들러로 레코드를 전달하는 QueueListener
+    
+    WARNING 이상 레코드는 같은 로거/레벨/메시지 템플릿이 coalesce_seconds 이내에 반복되면
+    첫 레코드만 즉시 기록하고, 나머지는 구간이 끝날 때 반복 횟수와 함께 한 줄로 기록합니다.
+    """
+    
+    def __init__(self, log_queue: queue.Queue, coalesce_seconds: float):
+        super().__init__(log_queue)
+        self.coalesce_seconds = coalesce_seconds
+        self.routes: Dict[str, List[logging.Handler]] = {}
+        self.pending: Dict[tuple, list] = {}
+    
+    def add_route(self, name: str, handlers: List[logging.Handler]):
+        """로거 이름에 대한 핸들러 목록을 등록합니다."""
+        self.routes[name] = handlers
+    
+    def dequeue(self, block: bool) -> logging.LogRecord:
+        if not block:
+            return self.queue.get(block)
+        # 레코드가 없어도 주기적으로 반복 경고를 기록
+        while True:
+            try:
+                return self.queue.get(True, 1.0)
+            except queue.Empty:
+                self.flush_coalesced()
+    
+    def handle(self, record: logging.LogRecord):
+        if self.coalesce_seconds > 0 and record.levelno >= logging.WARNING:
+            key = (record.name, record.levelno, record.msg)
+            entry = self.pending.get(key)
+            if entry is not None and record.created - entry[0] < self.coalesce_seconds:
+                entry[1] += 1
+                entry[2] = record
+                return
+            if entry is not None:
+                del self.pending[key]
+                self._emit_repeated(entry)
+            self.pending[key] = [record.created, 0, record]
+        
+        self._dispatch(record)
+        self.flush_coalesced()
+    
+    def flush_coalesced(self, force: bool = False):
+        """구간이 끝난 반복 경고를 기록합니다."""
+        # pending은 첫 레코드 시각 순으로 삽입되므로 구간이 끝나지 않은 항목에서 중단
+        now = time.time()
+        while self.pending:
+            key, entry = next(iter(self.pending.items()))
+            if not force and now - entry[0] < self.coalesce_seconds:
+                break
+            del self.pending[key]
+            self._emit_repeated(entry)
+    
+    def _emit_repeated(self, entry: list):
+        """반복된 레코드를 반복 횟수와 함께 한 줄로 기록합니다."""
+        first_created, count, record = entry
+        if count == 0:
+            return
+        summary = logging.makeLogRecord(record.__dict__)
+        summary.msg = f"{record.getMessage()} (최근 {record.created - first_created:.1f}초간 {count}회 반복)"
+        summary.args = None
+        summary.repeat_count = count
+        self._dispatch(summary)
+    
+    def _dispatch(self, record: logging.LogRecord):
+        """로거 이름에 등록된 핸들러로 레코드를 전달합니다."""
+        for handler in self.routes.get(record.name, ()):
+            if record.levelno >= handler.level:
+                handler.handle(record)
+    
+    def enqueue_sentinel(self):
+        # 큐가 가득 찬 상태에서도 종료되도록 리스너가 공간을 비울 때까지 대기
+        try:
+            self.queue.put(self._sentinel, True, 5.0)
+        except queue.Full:
+            pass
+    
+    def stop(self):
+        if self._thread is None:
+            return
+        thread, self._thread = self._thread, None
+        self.enqueue_sentinel()
+        # 리스너가 멈춰 sentinel을 넣지 못한 경우에도 종료가 막히지 않도록 제한 시간만 대기
+        thread.join(5.0)
+        if not thread.is_alive():
+            self.flush_coalesced(force=True)
+
+
+_lock = threading.Lock()
+_queue_handler: Optional[DroppingQueueHandler] = None
+_listener: Optional[CoalescingQueueListener] = None
+_console_handler: Optional[logging.Handler] = None
+
+
+def _create_formatter(config: Config) -> logging.Formatter:
+    """설정된 형식(text/json)의 포맷터를 생성합니다."""
+    if config.LOG_FORMAT == 'json':
+        from pythonjsonlogger import jsonlogger
+        return jsonlogger.JsonFormatter('%(asctime)s %(name)s %(levelname)s %(message)s', json_ensure_ascii=False)
+    return logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+
+def _get_queue_handler(config: Config) -> DroppingQueueHandler:
+    """공용 QueueHandler를 반환합니다. (최초 호출 시 리스너 스레드 시작)"""
+    global _queue_handler, _listener, _console_handler
+    if _queue_handler is None:
+        log_queue = queue.Queue(maxsize=config.LOG_QUEUE_SIZE)
+        _queue_handler = DroppingQueueHandler(log_queue)
+        _listener = CoalescingQueueListener(log_queue, config.LOG_COALESCE_SECONDS)
+        
+        # 콘솔 핸들러 (모든 로거 공용)
+        _console_handler = logging.StreamHandler()
+        _console_handler.setLevel(logging.INFO)
+        _console_handler.setFormatter(_create_formatter(config))
+        
+        _listener.start()
+        atexit.register(shutdown)
+    return _queue_handler
+
+
+def shutdown():
+    """리스너 스레드를 종료하고 남은 로그를 모두 기록합니다."""
+    global _queue_handler, _listener
+    with _lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+        if _queue_handler is not None:
+            if _queue_handler.dropped:
+                _console_handler.handle(logging.makeLogRecord({
+                    'name': 'Logger',
+                    'levelno': logging.WARNING,
+                    'levelname': 'WARNING',
+                    'msg': f"로그 큐 초과로 {_queue_handler.dropped}건의 로그가 기록되지 않음",
+                }))
+            _queue_handler = None
+
+
 class Logger:
     """로깅 관리 클래스"""
     
@@ -22,48 +196,45 @@ class Logger:
         logger = logging.getLogger(self.name)
         logger.setLevel(logging.INFO)
         
-        # 이미 핸들러가 설정되어 있다면 추가하지 않음
-        if logger.handlers:
-            return logger
-        
-        # 공통 포맷터
-        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-        
-        # 콘솔 핸들러
-        console_handler = logging.StreamHandler()
-        console_handler.setLevel(logging.INFO)
-        console_handler.setFormatter(formatter)
-        logger.addHandler(console_handler)
-        
-        # 파일 핸들러 (Rotating)
-        if not os.path.exists(self.log_dir):
-            os.makedirs(self.log_dir)
-        
-        log_file_path = os.path.join(self.log_dir, f'{self.name}.log')
-        file_handler = RotatingFileHandler(
-            log_file_path,
-            maxBytes=self.config.LOG_FILE_SIZE_MB * 1024 * 1024,  # MB to bytes
-            backupCount=self.config.LOG_BACKUP_COUNT,
-            encoding='utf-8'
-        )
-        file_handler.setLevel(logging.INFO)
-        file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+        with _lock:
+            # 이미 핸들러가 설정되어 있다면 추가하지 않음
+            if logger.handlers:
+                return logger
+            
+            queue_handler = _get_queue_handler(self.config)
+            
+            # 파일 핸들러 (Rotating)
+            if not os.path.exists(self.log_dir):
+                os.makedirs(self.log_dir)
+            
+            log_file_path = os.path.join(self.log_dir, f'{self.name}.log')
+            file_handler = RotatingFileHandler(
+                log_file_path,
+                maxBytes=self.config.LOG_FILE_SIZE_MB * 1024 * 1024,  # MB to bytes
+                backupCount=self.config.LOG_BACKUP_COUNT,
+                encoding='utf-8'
+            )
+            file_handler.setLevel(logging.INFO)
+            file_handler.setFormatter(_create_formatter(self.config))
+            
+            # 콘솔/파일 기록은 리스너 스레드에서 수행
+            _listener.add_route(self.name, [_console_handler, file_handler])
+            logger.addHandler(queue_handler)
         
         return logger
     
-    def info(self, message: str):
+    def info(self, message: str, *args):
         """정보 로그를 기록합니다."""
-        self.logger.info(message)
+        self.logger.info(message, *args)
     
-    def error(self, message: str):
+    def error(self, message: str, *args):
         """에러 로그를 기록합니다."""
-        self.logger.error(message)
+        self.logger.error(message, *args)
     
-    def warning(self, message: str):
+    def warning(self, message: str, *args):
         """경고 로그를 기록합니다."""
-        self.logger.warning(message)
+        self.logger.warning(message, *args)
     
-    def debug(self, message: str):
+    def debug(self, message: str, *args):
         """디버그 로그를 기록합니다."""
-        self.logger.debug(message)
+        self.logger.debug(message, *args)
@@ -0,0 +1,285 @@
+"""
+메시지 필드 projection/마스킹 유틸리티 모듈
+"""
+import json
+import fnmatch
+import hashlib
+from collections import OrderedDict
+from typing import Dict, Any, Callable, List, Optional, Tuple
+from config import Config
+
+
+# 필드 삭제 표시
+DROP = object()
+
+# 채널명 -> 적용 규칙 조회 결과 캐시 최대 크기
+CHANNEL_CACHE_SIZE = 10000
+
+
+def _build_path_tree(paths: List[str], leaf: Any, tree: Optional[Dict] = None) -> Dict:
+    """
+    '.'로 구분된 중첩 경로 목록을 트리로 변환합니다.
+    
+    Args:
+        paths: 필드 경로 목록 (예: "user.email")
+        leaf: 경로 끝에 둘 값
+        tree: 병합할 기존 트리
+        
+    Returns:
+        Dict: 필드명 -> 하위 트리 또는 leaf
+    """
+    tree = {} if tree is None else tree
+    for path in paths:
+        node = tree
+        parts = path.split('.')
+        for part in parts[:-1]:
+            # 더 짧은 경로가 이미 leaf이면 무시
+            if part in node and not isinstance(node[part], dict):
+                break
+            node = node.setdefault(part, {})
+        else:
+            node[parts[-1]] = leaf
+    return tree
+
+
+def _compile_include(tree: Dict) -> Callable[[Any], Any]:
+    """지정한 필드만 남기는 함수를 생성합니다. (리스트는 각 원소에 적용)"""
+    children = [
+        (key, _compile_include(subtree) if isinstance(subtree, dict) else None)
+        for key, subtree in tree.items()
+    ]
+    
+    def include(value: Any) -> Any:
+        if isinstance(value, list):
+            return [include(item) for item in value]
+        if not isinstance(value, dict):
+            return value
+        result = {}
+        for key, child in children:
+            if key in value:
+                result[key] = value[key] if child is None else child(value[key])
+        return result
+    
+    return include
+
+
+def _compile_rewrite(tree: Dict) -> Callable[[Any], Any]:
+    """지정한 필드를 삭제하거나 값을 바꾸는 함수를 생성합니다. (변경 경로만 복사)"""
+    children = [
+        (key, _compile_rewrite(subtree) if isinstance(subtree, dict) else None, subtree)
+        for key, subtree in tree.items()
+    ]
+    
+    def rewrite(value: Any) -> Any:
+        if isinstance(value, list):
+            return [rewrite(item) for item in value]
+        if not isinstance(value, dict):
+            return value
+        result = dict(value)
+        for key, child, action in children:
+            if key not in result:
+                continue
+            if child is not None:
+                result[key] = child(result[key])
+            elif action is DROP:
+                del result[key]
+            else:
+                result[key] = action(result[key])
+        return result
+    
+    return rewrite
+
+
+def _compile_truncate(max_length: int, exempt: Optional[Dict] = None) -> Callable[[Any], Any]:
+    """max_length보다 긴 문자열 값을 자르는 함수를 생성합니다. (exempt 트리의 leaf 필드는 제외)"""
+    children = {
+        key: _compile_truncate(max_length, subtree) if isinstance(subtree, dict) else None
+        for key, subtree in (exempt or {}).items()
+    }
+    plain = _compile_truncate(max_length) if children else None
+    
+    def truncate(value: Any) -> Any:
+        if isinstance(value, str):
+            if len(value) > max_length:
+                return f"{value[:max_length]}...({len(value)} chars)"
+            return value
+        if isinstance(value, dict):
+            if not children:
+                return {key: truncate(item) for key, item in value.items()}
+            result = {}
+            for key, item in value.items():
+                if key not in children:
+                    result[key] = plain(item)
+                elif children[key] is not None:
+                    result[key] = children[key](item)
+                else:
+                    result[key] = item
+            return result
+        if isinstance(value, list):
+            return [truncate(item) for item in value]
+        return value
+    
+    return truncate
+
+
+def _mask_function(mask_value: str) -> Callable[[Any], str]:
+    """값을 mask_value로 바꾸는 함수를 생성합니다."""
+    
+    def mask(value: Any) -> str:
+        return mask_value
+    
+    return mask
+
+
+def _hash_function(hash_salt: str) -> Callable[[Any], str]:
+    """값을 sha256(hash_salt + 값)으로 바꾸는 함수를 생성합니다."""
+    
+    def hash_value(value: Any) -> str:
+        text = value if isinstance(value, str) else json.dumps(value, ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256((hash_salt + text).encode('utf-8')).hexdigest()
+    
+    return hash_value
+
+
+def compile_rule(rule: Dict[str, Any], mask_value: str, hash_salt: str) -> Optional[Callable[[Dict[str, Any]], Dict[str, Any]]]:
+    """
+    채널 출력 규칙을 메시지 변환 함수로 컴파일합니다.
+    
+    적용 순서: include -> exclude/mask/hash -> max_string_length (마스킹/해시 값은 자르지 않음)
+    
+    Args:
+        rule: 출력 규칙 (include, exclude, mask, hash, max_string_length)
+        mask_value: 마스킹 값
+        hash_salt: 해시 salt
+        
+    Returns:
+        Callable: 변환 함수 (적용할 규칙이 없으면 None)
+    """
+    mask = _mask_function(mask_value)
+    hash_value = _hash_function(hash_salt)
+    
+    steps = []
+    if rule.get('include'):
+        steps.append(_compile_include(_build_path_tree(rule['include'], None)))
+    
+    rewrite_tree = _build_path_tree(rule.get('exclude', []), DROP)
+    rewrite_tree = _build_path_tree(rule.get('mask', []), mask, rewrite_tree)
+    rewrite_tree = _build_path_tree(rule.get('hash', []), hash_value, rewrite_tree)
+    if rewrite_tree:
+        steps.append(_compile_rewrite(rewrite_tree))
+    
+    if rule.get('max_string_length'):
+        redacted_tree = _build_path_tree(rule.get('mask', []) + rule.get('hash', []), None)
+        steps.append(_compile_truncate(rule['max_string_length'], redacted_tree))
+    
+    if not steps:
+        return None
+    if len(steps) == 1:
+        return steps[0]
+    
+    def transform(message_data: Dict[str, Any]) -> Dict[str, Any]:
+        for step in steps:
+            message_data = step(message_data)
+        return message_data
+    
+    return transform
+
+
+def compile_key_rule(rule: Dict[str, Any], key_field: str, mask_value: str,
+                     hash_salt: str) -> Optional[Callable[[Any], str]]:
+    """
+    키 필드가 mask/hash 대상이면 로그 헤더와 폴더명에 쓸 키 값 변환 함수를 생성합니다.
+    
+    Args:
+        rule: 출력 규칙
+        key_field: 키 필드명 (filtering.key_field)
+        mask_value: 마스킹 값
+        hash_salt: 해시 salt
+        
+    Returns:
+        Callable: 원본 키 값 -> 기록할 키 값 (변환하지 않으면 None)
+    """
+    if key_field in rule.get('mask', []):
+        return _mask_function(mask_value)
+    if key_field in rule.get('hash', []):
+        return _hash_function(hash_salt)
+    return None
+
+
+class MessageProjector:
+    """채널별 출력 규칙(projection/마스킹/truncate) 적용 클래스"""
+    
+    def __init__(self, rules: Dict[str, Dict[str, Any]] = None, mask_value: str = None, hash_salt: str = None):
+        self.config = Config()
+        self.rules = rules if rules is not None else self.config.PROJECTION_CHANNELS
+        self.mask_value = mask_value if mask_value is not None else self.config.PROJECTION_MASK_VALUE
+        self.hash_salt = hash_salt if hash_salt is not None else self.config.PROJECTION_HASH_SALT
+        self.key_field = self.config.KEY_FIELD
+        # 규칙은 생성 시 한 번만 컴파일: [(패턴, 메시지 변환, 키 값 변환)]
+        self.compiled_rules: List[Tuple[str, Optional[Callable], Optional[Callable]]] = [
+            (
+                pattern,
+                compile_rule(rule, self.mask_value, self.hash_salt),
+                compile_key_rule(rule, self.key_field, self.mask_value, self.hash_salt)
+            )
+            for pattern, rule in self.rules.items()
+        ]
+        self.channel_cache: OrderedDict = OrderedDict()
+    
+    def _match_channel(self, channel: str) -> Tuple[Optional[Callable], Optional[Callable]]:
+        """채널에 처음 일치하는 패턴 규칙의 (메시지 변환, 키 값 변환) 함수를 반환합니다."""
+        for pattern, transformer, key_transformer in self.compiled_rules:
+            if fnmatch.fnmatchcase(channel, pattern):
+                return transformer, key_transformer
+        return None, None
+    
+    def _get_transformers(self, channel: str) -> Tuple[Optional[Callable], Optional[Callable]]:
+        """
+        채널의 컴파일된 변환 함수를 반환합니다.
+        
+        채널명이 계속 늘어나도 메모리가 커지지 않도록 최근 조회한 채널을 최대 CHANNEL_CACHE_SIZE개까지만 캐시합니다.
+        """
+        if not self.compiled_rules:
+            return None, None
+        
+        transformers = self.channel_cache.get(channel)
+        if transformers is not None:
+            self.channel_cache.move_to_end(channel)
+            return transformers
+        
+        transformers = self._match_channel(channel)
+        if len(self.channel_cache) >= CHANNEL_CACHE_SIZE:
+            self.channel_cache.popitem(last=False)
+        self.channel_cache[channel] = transformers
+        return transformers
+    
+    def project(self, channel: str, message_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        채널 규칙을 적용한 메시지 데이터를 반환합니다.
+        
+        Args:
+            channel: 채널명
+            message_data: JSON 메시지 데이터 (변경하지 않음)
+            
+        Returns:
+            Dict: 규칙이 적용된 메시지 데이터 (규칙이 없으면 원본)
+        """
+        transformer = self._get_transformers(channel)[0]
+        return transformer(message_data) if transformer else message_data
+    
+    def project_key(self, channel: str, message_data: Dict[str, Any], key_value: str) -> str:
+        """
+        로그 헤더와 폴더명에 쓸 키 값을 반환합니다.
+        
+        키 필드가 채널 규칙의 mask/hash 대상이면 메시지 본문과 같은 값으로 바꿉니다.
+        
+        Args:
+            channel: 채널명
+            message_data: 원본 JSON 메시지 데이터
+            key_value: 추출한 키 값
+            
+        Returns:
+            str: 기록할 키 값
+        """
+        key_transformer = self._get_transformers(channel)[1]
+        return key_transformer(message_data[self.key_field]) if key_transformer else key_value
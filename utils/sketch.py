@@ -0,0 +1,68 @@
+"""
+근사 집계 유틸리티 모듈
+"""
+from typing import Dict, Hashable, List, Tuple
+
+
+class CountMinSketch:
+    """고정 메모리로 항목별 빈도를 근사하는 Count-Min Sketch 클래스"""
+
+    def __init__(self, width: int, depth: int):
+        self.width = width
+        self.depth = depth
+        self.tables = [[0] * width for _ in range(depth)]
+
+    def _indexes(self, item: Hashable):
+        """행마다 다른 시드로 해시한 열 인덱스를 반환합니다."""
+        for row in range(self.depth):
+            yield row, hash((row, item)) % self.width
+
+    def add(self, item: Hashable, count: int = 1) -> int:
+        """
+        항목의 빈도를 증가시키고 추정 빈도를 반환합니다.
+
+        Args:
+            item: 항목
+            count: 증가량
+
+        Returns:
+            int: 증가 후 추정 빈도 (실제 빈도 이상)
+        """
+        estimate = None
+        for row, index in self._indexes(item):
+            self.tables[row][index] += count
+            value = self.tables[row][index]
+            if estimate is None or value < estimate:
+                estimate = value
+        return estimate
+
+    def estimate(self, item: Hashable) -> int:
+        """항목의 추정 빈도를 반환합니다."""
+        return min(self.tables[row][index] for row, index in self._indexes(item))
+
+
+class TopK:
+    """Count-Min Sketch 기반 상위 K개 heavy hitter 추적 클래스"""
+
+    def __init__(self, k: int, width: int, depth: int):
+        self.k = k
+        self.sketch = CountMinSketch(width, depth)
+        self.candidates: Dict[Hashable, int] = {}
+
+    def add(self, item: Hashable, count: int = 1):
+        """항목을 추가하고 상위 K개 후보를 갱신합니다."""
+        estimate = self.sketch.add(item, count)
+
+        if item in self.candidates or len(self.candidates) < self.k:
+            self.candidates[item] = estimate
+            return
+
+        # 후보 중 최소 빈도보다 크면 교체
+        min_item = min(self.candidates, key=self.candidates.get)
+        if estimate > self.candidates[min_item]:
+            del self.candidates[min_item]
+            self.candidates[item] = estimate
+
+    def items(self) -> List[Tuple[Hashable, int]]:
+        """추정 빈도 내림차순으로 상위 K개 항목을 반환합니다."""
+        return sorted(self.candidates.items(), key=lambda entry: entry[1], reverse=True)